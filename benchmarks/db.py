@@ -0,0 +1,192 @@
+# Микробенчмарк слоя БД и проверка планов запросов.
+# Заполняет временную базу, замеряет каждый хелпер и прогоняет
+# EXPLAIN QUERY PLAN по всем SQL, которые он реально выполнил.
+# Полный проход по таблице (SCAN) или сортировка во временном B-tree
+# считаются регрессией — скрипт завершается с кодом 1.
+# Запуск: python -m benchmarks.db --sizes 10000 100000 1000000
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+from benchmarks.fakes import prepare_env
+
+FIRST_USER_ID = 10_000
+REPEAT = 200
+
+# Хелперы (или отдельные сценарии "хелпер:сценарий"), которым полный проход положен по смыслу.
+# Поиск по подстроке ника — запасной шаг, когда точное совпадение и префикс ничего не дали
+FULL_SCAN_ALLOWED = {
+    "get_all_broadcasts", "delete_all_broadcasts", "get_all_admins", "get_scheduled_broadcasts",
+    "find_user_by_username:substring"
+}
+
+
+def seed_database(db_path: str, users: int):
+    statuses = ["approved"] * 8 + ["pending", "rejected"]
+    with sqlite3.connect(db_path) as db:
+        db.executemany("""
+            INSERT INTO users (user_id, username, nickname, status, percent, profits_count,
+                               profits_sum, wallet, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, datetime('now', ?))
+        """, (
+            (
+                FIRST_USER_ID + i, f"user{i}", f"nick{i}", statuses[i % len(statuses)],
+                50 + i % 30, i % 17, float(i % 1000), None, f"-{i % 100000} seconds"
+            )
+            for i in range(users)
+        ))
+        db.executemany(
+            "INSERT INTO applications (user_id, source, experience, availability, motivation, status, submitted_at) "
+            "VALUES (?, 'ads', 'none', '4h', 'money', ?, datetime('now', ?))",
+            (
+                (FIRST_USER_ID + i, statuses[i % len(statuses)], f"-{i % 100000} seconds")
+                for i in range(users)
+            )
+        )
+        db.executemany(
+            "INSERT INTO broadcasts (message_ids, content_type, content) VALUES (?, 'text', ?)",
+            (("[1, 2, 3]", f"broadcast {i}") for i in range(max(1, users // 100)))
+        )
+        db.executemany(
+            "INSERT INTO outbox (chat_id, text, next_attempt_at) VALUES (?, 'notice', ?)",
+            ((FIRST_USER_ID + i, i % 2 * 1e12) for i in range(max(1, users // 10)))
+        )
+        db.executemany(
+            "INSERT INTO scheduled_broadcasts (from_chat_id, message_ids, next_run_at, repeat_interval) "
+            "VALUES (1, '[1]', ?, 3600)",
+            ((float(i),) for i in range(100))
+        )
+        db.executemany(
+            "INSERT INTO stats_daily (day, metric, value) VALUES (date('now', ?), ?, ?)",
+            (
+                (f"-{day} days", metric, day % 7)
+                for day in range(365)
+                for metric in ("applications", "approved", "rejected", "banned", "profits")
+            )
+        )
+        db.execute("ANALYZE")
+
+
+def build_cases(bot_db, scheduler, users: int) -> list:
+    def user_id():
+        return FIRST_USER_ID + random.randrange(users)
+
+    return [
+        ("get_user", lambda: bot_db.get_user(user_id())),
+        ("find_user_by_username", lambda: bot_db.find_user_by_username(f"@USER{random.randrange(users)}")),
+        ("find_user_by_username:prefix", lambda: bot_db.find_user_by_username("user")),
+        ("find_user_by_username:substring", lambda: bot_db.find_user_by_username("ser9999")),
+        ("get_stats", lambda: bot_db.get_stats()),
+        ("get_pending_page", lambda: bot_db.get_pending_page(random.randrange(10))),
+        ("get_pending_page:review", lambda: bot_db.get_pending_page(random.randrange(50), 5)),
+        ("change_user_status", lambda: bot_db.change_user_status(user_id(), "approved", ("pending",))),
+        ("update_nickname", lambda: bot_db.update_nickname(user_id(), "nick")),
+        ("update_wallet", lambda: bot_db.update_wallet(user_id(), None)),
+        ("get_wallets_after", lambda: bot_db.get_wallets_after(user_id(), 1000)),
+        ("set_wallet_flags", lambda: bot_db.set_wallet_flags([(1, user_id(), "wallet")])),
+        ("update_percent", lambda: bot_db.update_percent(user_id(), 70)),
+        ("add_profit", lambda: bot_db.add_profit(user_id(), 1.0)),
+        ("remove_profit", lambda: bot_db.remove_profit(user_id(), 1.0)),
+        ("mark_deliverable", lambda: bot_db.mark_deliverable(user_id())),
+        ("mark_undeliverable", lambda: bot_db.mark_undeliverable([user_id()])),
+        ("bulk_change_status", lambda: bot_db.bulk_change_status(
+            [user_id() for _ in range(50)], "approved", ("pending",))),
+        ("bulk_add_profits", lambda: bot_db.bulk_add_profits([(user_id(), 1.0) for _ in range(50)])),
+        ("save_application", lambda: bot_db.save_application(user_id(), "user", {"q": "a"})),
+        ("get_recent_broadcasts", lambda: bot_db.get_recent_broadcasts(10)),
+        ("get_broadcast", lambda: bot_db.get_broadcast(random.randrange(1, users // 100 + 1))),
+        ("get_all_admins", lambda: bot_db.get_all_admins()),
+        ("claim_outbox", lambda: bot_db.claim_outbox(100, 0)),
+        ("get_scheduled_broadcasts", lambda: bot_db.get_scheduled_broadcasts()),
+        ("get_scheduled_broadcast", lambda: bot_db.get_scheduled_broadcast(random.randrange(1, 101))),
+        ("claim_scheduled_run", lambda: bot_db.claim_scheduled_run(random.randrange(1, 101), 0.0, 1.0)),
+        ("try_acquire_lease", lambda: scheduler.try_acquire_lease("bench", "holder", 10)),
+        ("get_last_run", lambda: scheduler.get_last_run("bench")),
+        ("record_run", lambda: scheduler.record_run("bench", 0.0)),
+        ("count_segment:percent", lambda: bot_db.count_segment({"percent": [70, 75]})),
+        ("count_segment:profits", lambda: bot_db.count_segment({"profits": [990, None], "wallet": False})),
+        ("count_segment:joined", lambda: bot_db.count_segment(
+            {"statuses": ["approved", "pending"], "joined": ["2000-01-01", None]})),
+        ("get_segment_users", lambda: bot_db.get_segment_users({"percent": [79, None], "profits": [900, None]})),
+        ("record_rollups", lambda: bot_db.record_rollups({"broadcast_sent": 10, "broadcast_failed": 1})),
+        ("get_rollups", lambda: bot_db.get_rollups(90)),
+        ("get_all_approved_users", lambda: bot_db.get_all_approved_users()),
+        ("get_all_broadcasts", lambda: bot_db.get_all_broadcasts()),
+    ]
+
+
+def plan_problems(db, sql: str) -> list:
+    problems = []
+    for row in db.execute(f"EXPLAIN QUERY PLAN {sql}"):
+        detail = row[3]
+        # Обход индекса по порядку с LIMIT останавливается после первых строк
+        if detail.startswith("SCAN ") and "INDEX" in detail and " LIMIT " in sql.upper():
+            continue
+        if detail.startswith("SCAN ") or "USE TEMP B-TREE" in detail:
+            problems.append(detail)
+    return problems
+
+
+async def run_size(bot_db, scheduler, users: int) -> bool:
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    bot_db.DB_NAME = db_path
+    await bot_db.init_db()
+    seed_database(db_path, users)
+    print(f"\n== {users} пользователей ==")
+
+    ok = True
+    plans = sqlite3.connect(db_path)
+    for name, call in build_cases(bot_db, scheduler, users):
+        statements = []
+        bot_db.DB_TRACE = statements.append
+        await call()
+        bot_db.DB_TRACE = None
+
+        repeat = 5 if name in ("get_all_approved_users", "get_all_broadcasts") else REPEAT
+        started = time.perf_counter()
+        for _ in range(repeat):
+            await call()
+        per_call_ms = (time.perf_counter() - started) * 1000 / repeat
+
+        helper = name.split(":")[0]
+        problems = []
+        for sql in statements:
+            if sql.lstrip().split(None, 1)[0].upper() not in ("SELECT", "UPDATE", "DELETE", "INSERT"):
+                continue
+            for detail in plan_problems(plans, sql):
+                if FULL_SCAN_ALLOWED & {helper, name} and detail.startswith("SCAN "):
+                    continue
+                problems.append(f"{detail}  <- {' '.join(sql.split())[:80]}")
+        ok = ok and not problems
+        print(f"{name:30} {per_call_ms:9.3f} ms{'  PLAN REGRESSION' if problems else ''}")
+        for problem in problems:
+            print(f"    {problem}")
+    plans.close()
+    return ok
+
+
+async def run(sizes: list) -> bool:
+    from team_bot import db as bot_db, scheduler
+
+    results = [await run_size(bot_db, scheduler, users) for users in sizes]
+    return all(results)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    prepare_env(os.path.join(tempfile.mkdtemp(), "bench.db"), LOG_LEVEL="WARNING")
+    random.seed(0)
+    if not asyncio.run(run(args.sizes)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
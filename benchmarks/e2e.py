@@ -0,0 +1,184 @@
+# Сквозной бенчмарк: синтетические апдейты через настоящий router,
+# Bot с FakeSession и временная SQLite-база с заданным числом пользователей.
+# Запуск: python -m benchmarks.e2e --users 10000 --output bench_e2e.json
+#         python -m benchmarks.e2e --baseline bench_e2e.json  # сравнение
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.fakes import FakeSession, callback_update, message_update, prepare_env
+
+ADMIN_ID = 8343231096
+FIRST_USER_ID = 10_000
+NEW_USER_ID = 5_000_000
+
+new_user_ids = itertools.count(NEW_USER_ID)
+
+
+def seed_database(db_path: str, users: int):
+    # 80% одобренных, остальные поровну pending и rejected
+    statuses = ["approved"] * 8 + ["pending", "rejected"]
+    with sqlite3.connect(db_path) as db:
+        db.executemany("""
+            INSERT INTO users (user_id, username, nickname, status, percent, profits_count, profits_sum, wallet)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            (
+                FIRST_USER_ID + i, f"user{i}", f"nick{i}", statuses[i % len(statuses)],
+                50 + i % 30, i % 17, float(i % 1000), None
+            )
+            for i in range(users)
+        ))
+
+
+def approved_user(users: int) -> int:
+    while True:
+        i = random.randrange(users)
+        if i % 10 < 8:
+            return FIRST_USER_ID + i
+
+
+def scenario_start(users: int):
+    return [message_update(approved_user(users), "/start")]
+
+
+def scenario_application_flow(users: int):
+    user_id = next(new_user_ids)
+    return [
+        message_update(user_id, "/start"),
+        callback_update(user_id, "apply"),
+        message_update(user_id, "Из чата"),
+        message_update(user_id, "Год"),
+        message_update(user_id, "4 часа в день"),
+        message_update(user_id, "Потому что"),
+        callback_update(user_id, "submit")
+    ]
+
+
+def scenario_profile(users: int):
+    return [message_update(approved_user(users), "Мой профиль")]
+
+
+def scenario_admin_search(users: int):
+    return [
+        callback_update(ADMIN_ID, "admin_search"),
+        message_update(ADMIN_ID, f"@user{random.randrange(users)}")
+    ]
+
+
+def scenario_stats(users: int):
+    return [callback_update(ADMIN_ID, "admin_stats")]
+
+
+def scenario_broadcast(users: int):
+    return [
+        callback_update(ADMIN_ID, "broadcast_all"),
+        message_update(ADMIN_ID, "Синтетическая рассылка")
+    ]
+
+
+# сценарий: (генератор апдейтов одной итерации, число итераций)
+SCENARIOS = {
+    "start": (scenario_start, 1000),
+    "application_flow": (scenario_application_flow, 200),
+    "profile": (scenario_profile, 1000),
+    "admin_search": (scenario_admin_search, 300),
+    "stats": (scenario_stats, 300),
+    "broadcast": (scenario_broadcast, 3)
+}
+
+
+async def run_scenario(app, build, iterations: int, users: int) -> dict:
+    from team_bot.profiling import LatencyHistogram
+
+    histogram = LatencyHistogram()
+    batches = [build(users) for _ in range(iterations)]
+    started = time.perf_counter()
+    for updates in batches:
+        iteration_started = time.perf_counter_ns()
+        for update in updates:
+            await app.dp.feed_update(app.bot, update)
+        histogram.record((time.perf_counter_ns() - iteration_started) // 1000)
+    elapsed = time.perf_counter() - started
+    return {
+        "iterations": iterations,
+        "updates": sum(len(updates) for updates in batches),
+        "throughput": iterations / elapsed,
+        "p50_ms": histogram.percentile(50) / 1000,
+        "p95_ms": histogram.percentile(95) / 1000,
+        "p99_ms": histogram.percentile(99) / 1000
+    }
+
+
+async def run(users: int, scenarios: list, scale: float) -> dict:
+    from team_bot import app
+    from team_bot.config import DB_NAME
+    from team_bot.db import init_db
+
+    await init_db()
+    seed_database(DB_NAME, users)
+    app.create_app(FakeSession())
+
+    results = {}
+    for name in scenarios:
+        build, iterations = SCENARIOS[name]
+        results[name] = await run_scenario(app, build, max(1, int(iterations * scale)), users)
+        print(
+            f"{name:18} {results[name]['throughput']:9.1f} it/s   "
+            f"p50 {results[name]['p50_ms']:8.2f} ms   p99 {results[name]['p99_ms']:8.2f} ms"
+        )
+    return results
+
+
+def compare(results: dict, baseline_path: str, tolerance: float) -> bool:
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["scenarios"]
+    ok = True
+    for name, current in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["p99_ms"]
+        change = (current["p99_ms"] - before) / before if before else 0.0
+        regressed = change > tolerance
+        ok = ok and not regressed
+        print(f"{name:18} p99 {before:8.2f} -> {current['p99_ms']:8.2f} ms ({change:+.0%}){'  REGRESSION' if regressed else ''}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--scale", type=float, default=1.0, help="множитель числа итераций")
+    parser.add_argument("--output", default="bench_e2e.json")
+    parser.add_argument("--baseline", help="предыдущий результат для сравнения")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="допустимый рост p99")
+    args = parser.parse_args()
+
+    prepare_env(os.path.join(tempfile.mkdtemp(), "bench.db"), LOG_LEVEL="WARNING", BROADCAST_DELAY=0)
+    random.seed(0)
+    results = asyncio.run(run(args.users, args.scenarios, args.scale))
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "users": args.users,
+            "scenarios": results
+        }, f, ensure_ascii=False, indent=2)
+
+    if args.baseline and not compare(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
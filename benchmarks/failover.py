@@ -0,0 +1,80 @@
+# Симуляция падения лидера планировщика: два процесса делят аренду в общей
+# SQLite-базе, лидер убивается SIGKILL, замеряется время до перехвата.
+# Запуск: python -m benchmarks.failover
+import asyncio
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import time
+
+from benchmarks.fakes import prepare_env
+
+TTL = 2.0
+RENEW_INTERVAL = 0.5
+TICK = 0.1
+
+
+def instance(name: str, db_path: str):
+    prepare_env(db_path, LOG_LEVEL="WARNING")
+    from team_bot.scheduler import Scheduler
+
+    scheduler = Scheduler(holder=name, ttl=TTL, renew_interval=RENEW_INTERVAL)
+
+    @scheduler.every(TICK)
+    async def heartbeat():
+        with sqlite3.connect(db_path) as db:
+            db.execute("INSERT INTO ticks (holder, at) VALUES (?, ?)", (name, time.time()))
+
+    asyncio.run(scheduler.run())
+
+
+def last_tick(db_path: str):
+    with sqlite3.connect(db_path) as db:
+        return db.execute("SELECT holder, at FROM ticks ORDER BY at DESC LIMIT 1").fetchone()
+
+
+def main():
+    db_path = os.path.join(tempfile.mkdtemp(), "failover.db")
+    prepare_env(db_path, LOG_LEVEL="WARNING")
+    from team_bot.db import init_db
+
+    asyncio.run(init_db())
+    with sqlite3.connect(db_path) as db:
+        db.execute("CREATE TABLE ticks (holder TEXT, at REAL)")
+
+    context = multiprocessing.get_context("spawn")
+    processes = {
+        name: context.Process(target=instance, args=(name, db_path), daemon=True)
+        for name in ("a", "b")
+    }
+    for process in processes.values():
+        process.start()
+
+    deadline = time.time() + 30
+    while last_tick(db_path) is None:
+        assert time.time() < deadline, "no leader elected"
+        time.sleep(TICK)
+    leader, _ = last_tick(db_path)
+    standby = "b" if leader == "a" else "a"
+
+    processes[leader].kill()
+    killed_at = time.time()
+    while last_tick(db_path)[0] != standby:
+        assert time.time() < killed_at + TTL * 5, "standby did not take over"
+        time.sleep(TICK)
+    takeover = last_tick(db_path)[1] - killed_at
+
+    with sqlite3.connect(db_path) as db:
+        overlap = db.execute(
+            "SELECT COUNT(*) FROM ticks WHERE holder = ? AND at > ?", (leader, killed_at)
+        ).fetchone()[0]
+    processes[standby].kill()
+
+    print(f"leader={leader} standby={standby} takeover={takeover:.2f}s (ttl={TTL}s)")
+    assert overlap == 0, "killed leader kept running jobs"
+    assert takeover <= TTL + RENEW_INTERVAL + TICK * 2, "takeover slower than lease expiry"
+
+
+if __name__ == "__main__":
+    main()
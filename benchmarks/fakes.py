@@ -0,0 +1,111 @@
+import asyncio
+import itertools
+import os
+import typing
+from collections import Counter
+from datetime import datetime
+
+from aiogram.client.session.base import BaseSession
+from aiogram.types import Chat, Message, MessageId, Update, User
+
+FAKE_TOKEN = "42:BENCHMARK"
+
+
+def prepare_env(db_path: str, **extra):
+    # Должно вызываться до импорта team_bot: конфиг читается при импорте
+    os.environ["BOT_TOKEN"] = FAKE_TOKEN
+    os.environ["DB_NAME"] = db_path
+    os.environ["METRICS_PORT"] = "0"
+    # Воркеры супервизора запускают планировщик, а бэкап без расписания в прошлом
+    # выполняется сразу — без этого бенчмарки писали бы снапшоты в ./backups
+    os.environ["BACKUP_INTERVAL"] = "0"
+    os.environ["BACKUP_DIR"] = os.path.join(os.path.dirname(os.path.abspath(db_path)), "backups")
+    for key, value in extra.items():
+        os.environ[key] = str(value)
+
+
+class FakeSession(BaseSession):
+    # Сессия без сети: отвечает правдоподобными объектами на любые методы
+    def __init__(self, latency: float = 0.0):
+        super().__init__()
+        self.latency = latency
+        self.calls = Counter()
+        self.message_ids = itertools.count(1_000_000)
+
+    async def make_request(self, bot, method, timeout=None):
+        self.calls[type(method).__name__] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        result = self.build_result(method)
+        return result.as_(bot) if hasattr(result, "as_") else result
+
+    def build_result(self, method):
+        returning = method.__returning__
+        options = typing.get_args(returning) or (returning,)
+        if Message in options:
+            chat_id = getattr(method, "chat_id", None) or 1
+            return Message(
+                message_id=next(self.message_ids),
+                date=datetime.now(),
+                chat=Chat(id=int(chat_id), type="private"),
+                text=getattr(method, "text", None)
+            )
+        if MessageId in options:
+            return MessageId(message_id=next(self.message_ids))
+        if typing.get_origin(returning) is list:
+            item = typing.get_args(returning)[0]
+            if item is MessageId:
+                return [MessageId(message_id=next(self.message_ids)) for _ in method.message_ids]
+            return []
+        if User in options:
+            return User(id=42, is_bot=True, first_name="bench", username="bench_bot")
+        return True
+
+    async def close(self):
+        pass
+
+    async def stream_content(self, url, headers=None, timeout=30, chunk_size=65536, raise_for_status=True):
+        yield b""
+
+
+update_ids = itertools.count(1)
+message_ids = itertools.count(1)
+
+
+def make_user(user_id: int) -> dict:
+    return {"id": user_id, "is_bot": False, "first_name": f"user{user_id}", "username": f"user{user_id}"}
+
+
+def chat_type(chat_id: int = None) -> str:
+    return "supergroup" if chat_id and chat_id < 0 else "private"
+
+
+def message_update(user_id: int, text: str, chat_id: int = None) -> Update:
+    return Update.model_validate({
+        "update_id": next(update_ids),
+        "message": {
+            "message_id": next(message_ids),
+            "date": int(datetime.now().timestamp()),
+            "chat": {"id": chat_id or user_id, "type": chat_type(chat_id)},
+            "from": make_user(user_id),
+            "text": text
+        }
+    })
+
+
+def callback_update(user_id: int, data: str, chat_id: int = None, text: str = "card") -> Update:
+    return Update.model_validate({
+        "update_id": next(update_ids),
+        "callback_query": {
+            "id": str(next(update_ids)),
+            "from": make_user(user_id),
+            "chat_instance": "bench",
+            "data": data,
+            "message": {
+                "message_id": next(message_ids),
+                "date": int(datetime.now().timestamp()),
+                "chat": {"id": chat_id or user_id, "type": chat_type(chat_id)},
+                "text": text
+            }
+        }
+    })
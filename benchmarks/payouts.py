@@ -0,0 +1,74 @@
+# Отчёт о выплатах на синтетической базе: загрузка колонок, расчёт и сборка CSV.
+# Завершается с кодом 1, если полный путь дольше бюджета.
+# Запуск: python -m benchmarks.payouts --members 100000 --budget-ms 1000
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+from benchmarks.fakes import prepare_env
+
+
+def seed_members(db_path: str, members: int):
+    with sqlite3.connect(db_path) as db:
+        db.executemany("""
+            INSERT INTO users (user_id, username, status, percent, profits_count, profits_sum, wallet)
+            VALUES (?, ?, 'approved', ?, 1, ?, ?)
+        """, (
+            (1_000 + i, f"user{i}", 50 + i % 30, float(i % 5000) + 0.5, None if i % 7 == 0 else f"UQ{i:046d}")
+            for i in range(members)
+        ))
+        db.execute("ANALYZE")
+
+
+async def measure() -> dict:
+    from team_bot.db import get_payout_rows
+    from team_bot.payouts import build_payout_csv, compute_payouts
+
+    phases = {}
+    started = time.perf_counter()
+    rows = await get_payout_rows()
+    phases["load"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    report = compute_payouts(rows)
+    phases["compute"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    data = build_payout_csv(rows, report)
+    phases["csv"] = time.perf_counter() - started
+    phases["total"] = sum(phases.values())
+    return phases, (
+        f"members={report['count']} payout={report['total']:.2f}$ "
+        f"missing={len(report['missing'])} csv={len(data) // 1024} KiB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--budget-ms", type=float, default=1000)
+    parser.add_argument("--runs", type=int, default=3, help="берётся лучший прогон")
+    args = parser.parse_args()
+
+    prepare_env(os.path.join(tempfile.mkdtemp(), "bench.db"), LOG_LEVEL="WARNING")
+    from team_bot.config import DB_NAME
+    from team_bot.db import init_db
+
+    asyncio.run(init_db())
+    seed_members(DB_NAME, args.members)
+
+    runs = [asyncio.run(measure()) for _ in range(args.runs)]
+    phases, summary = min(runs, key=lambda run: run[0]["total"])
+    print(summary)
+    print("  " + "  ".join(f"{name}={seconds * 1000:.0f} ms" for name, seconds in phases.items()))
+    if phases["total"] * 1000 > args.budget_ms:
+        print(f"FAIL: дольше бюджета {args.budget_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
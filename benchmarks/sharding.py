@@ -0,0 +1,54 @@
+# Нагрузочный тест супервизора: синтетический поток /start на 1..N воркеров.
+# Запуск: python -m benchmarks.sharding --updates 20000 --workers 1 2 4
+import argparse
+import asyncio
+import os
+import sqlite3
+import tempfile
+
+from benchmarks.fakes import FakeSession, message_update, prepare_env
+
+
+async def fake_source(count: int):
+    # Каждый апдейт — от своего пользователя: повторные /start одного
+    # пользователя отсекает антифлуд (группа "start"), и тест мерил бы отбрасывания
+    for i in range(count):
+        yield message_update(1_000 + i, "/start")
+
+
+def seed_users(db_path: str, users: int):
+    with sqlite3.connect(db_path) as db:
+        db.executemany(
+            "INSERT OR IGNORE INTO users (user_id, username, status) VALUES (?, ?, 'approved')",
+            [(1_000 + i, f"user{i}") for i in range(users)]
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--updates", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    prepare_env(os.path.join(tempfile.mkdtemp(), "bench.db"), LOG_LEVEL="WARNING")
+    from team_bot.config import DB_NAME
+    from team_bot.db import init_db
+    from team_bot.workers import run_supervisor
+
+    asyncio.run(init_db())
+    seed_users(DB_NAME, args.updates)
+
+    # На машине с меньшим числом ядер, чем воркеров, ускорение не показательно
+    print(f"cpus={os.cpu_count()}")
+    baseline = None
+    for workers in args.workers:
+        elapsed = run_supervisor(workers, fake_source(args.updates), FakeSession)
+        rate = args.updates / elapsed
+        baseline = baseline or rate
+        with sqlite3.connect(DB_NAME) as db:
+            sessions = db.execute("SELECT COUNT(*) FROM fsm_storage").fetchone()[0]
+        print(f"workers={workers} updates/s={rate:.0f} speedup={rate / baseline:.2f}x fsm_rows={sessions}")
+
+
+if __name__ == "__main__":
+    main()
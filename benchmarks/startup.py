@@ -0,0 +1,102 @@
+# Время старта: импорт модуля (python -X importtime) и фазы запуска —
+# create_app, init_db на новой и уже размеченной базе, прогрев.
+# Импорт идёт без BOT_TOKEN: модуль не должен ничего создавать при загрузке.
+# Запуск: python -m benchmarks.startup --budget-ms 3000 --self-budget-ms 30
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.fakes import FakeSession, prepare_env
+
+# Модули, которые нужны только отдельным командам и должны грузиться лениво
+LAZY_MODULES = ("multiprocessing", "aiohttp.web", "gzip", "team_bot.handlers.admin", "team_bot.handlers.broadcast")
+
+
+def measure_import() -> dict:
+    env = {k: v for k, v in os.environ.items() if k != "BOT_TOKEN"}
+    env["METRICS_PORT"] = "0"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import bot"],
+        env=env, capture_output=True, text=True, check=True
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+async def measure_phases() -> dict:
+    from team_bot import app
+    from team_bot.db import init_db
+
+    phases = {}
+    started = time.perf_counter()
+    app.create_app(FakeSession())
+    phases["create_app"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await init_db()
+    phases["init_db_fresh"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await init_db()
+    phases["init_db_migrated"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await app.warm_up()
+    phases["warm_up"] = time.perf_counter() - started
+    return phases
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3, help="берётся лучший прогон импорта")
+    parser.add_argument("--budget-ms", type=float, default=3000, help="полное время `import bot`")
+    parser.add_argument("--self-budget-ms", type=float, default=30, help="собственное время bot и team_bot")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [measure_import() for _ in range(args.runs)]
+    best = min(runs, key=lambda modules: modules["bot"][1])
+    total_ms = best["bot"][1] / 1000
+    # собственное время точки входа и модулей пакета, без aiogram и stdlib
+    self_ms = sum(
+        own for name, (own, _) in best.items()
+        if name == "bot" or name.split(".")[0] == "team_bot"
+    ) / 1000
+    print(f"import bot: {total_ms:.0f} ms (свой код {self_ms:.1f} ms)")
+    print("Тяжёлые модули (собственное время):")
+    for name, (own, _) in sorted(best.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"  {own / 1000:8.1f} ms  {name}")
+
+    ok = True
+    if total_ms > args.budget_ms:
+        print(f"FAIL: импорт дольше бюджета {args.budget_ms:.0f} ms")
+        ok = False
+    if self_ms > args.self_budget_ms:
+        print(f"FAIL: свой код дольше бюджета {args.self_budget_ms:.0f} ms")
+        ok = False
+    eager = [name for name in LAZY_MODULES if name in best]
+    if eager:
+        print(f"FAIL: загружены при импорте: {', '.join(eager)}")
+        ok = False
+
+    prepare_env(os.path.join(tempfile.mkdtemp(), "bench.db"), LOG_LEVEL="WARNING")
+    for name, seconds in asyncio.run(measure_phases()).items():
+        print(f"{name:18} {seconds * 1000:8.1f} ms")
+
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Проверка TON-адресов: одна проверка (из LRU-кэша и без него) и полная
+# перепроверка сохранённых кошельков на синтетической базе, где часть адресов
+# с опечатками. Завершается с кодом 1, если проверка дольше бюджета.
+# Запуск: python -m benchmarks.wallets --members 100000 --check-budget-us 10
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import timeit
+
+from benchmarks.fakes import prepare_env
+
+
+def make_wallet(i: int, typo: bool) -> str:
+    from team_bot.ton import to_friendly
+
+    address = to_friendly(0, i.to_bytes(32, "big"), bounceable=i % 2 == 0)
+    if typo:
+        address = address[:20] + ("A" if address[20] != "A" else "B") + address[21:]
+    return address
+
+
+def seed_members(db_path: str, members: int):
+    with sqlite3.connect(db_path) as db:
+        db.executemany(
+            "INSERT INTO users (user_id, status, wallet) VALUES (?, 'approved', ?)",
+            ((1_000 + i, make_wallet(i, i % 50 == 0)) for i in range(members))
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--check-budget-us", type=float, default=10)
+    parser.add_argument("--number", type=int, default=100_000, help="проверок на замер")
+    args = parser.parse_args()
+
+    prepare_env(os.path.join(tempfile.mkdtemp(), "bench.db"), LOG_LEVEL="ERROR")
+    from team_bot.config import DB_NAME
+    from team_bot.db import init_db
+    from team_bot.scheduler import revalidate_wallets
+    from team_bot.ton import normalize_ton_address, parse_ton_address
+
+    address = make_wallet(7, typo=False)
+    cached = timeit.timeit(lambda: parse_ton_address(address), number=args.number) / args.number
+    uncached = timeit.timeit(lambda: parse_ton_address.__wrapped__(address), number=args.number) / args.number
+    normalize = timeit.timeit(lambda: normalize_ton_address(address), number=args.number) / args.number
+    print(
+        f"проверка адреса: {cached * 1e6:.2f} us из кэша, {uncached * 1e6:.2f} us без кэша, "
+        f"нормализация {normalize * 1e6:.2f} us"
+    )
+
+    asyncio.run(init_db())
+    seed_members(DB_NAME, args.members)
+    started = time.perf_counter()
+    asyncio.run(revalidate_wallets())
+    elapsed = time.perf_counter() - started
+    with sqlite3.connect(DB_NAME) as db:
+        invalid = db.execute("SELECT COUNT(*) FROM users WHERE wallet_invalid = 1").fetchone()[0]
+    print(f"перепроверка {args.members} кошельков: {elapsed * 1000:.0f} ms, неверных {invalid}")
+
+    ok = True
+    if uncached * 1e6 > args.check_budget_us:
+        print(f"FAIL: проверка дольше бюджета {args.check_budget_us:.0f} us")
+        ok = False
+    if invalid != len(range(0, args.members, 50)):
+        print("FAIL: перепроверка нашла не все адреса с опечатками")
+        ok = False
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import asyncio
+import logging
+import time
+
+from aiogram import Bot, Dispatcher
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from team_bot.config import BOT_TOKEN, DB_NAME, FSM_STORAGE, LOG_LEVEL
+from team_bot.db import get_stats, refresh_admins_cache
+from team_bot.metrics import ApiMetricsMiddleware, UpdateMetricsMiddleware, metrics
+from team_bot.profiling import ApiTimingMiddleware, PerfMiddleware
+from team_bot.session import TelegramSession
+from team_bot.storage import SQLiteStorage
+
+# ==================== НАСТРОЙКА ====================
+logging.basicConfig(level=LOG_LEVEL)
+# storage, dp и bot создаёт create_app(): импорт пакета не требует токена.
+# Остальные модули обращаются к ним как app.bot / app.storage
+storage = None
+dp = None
+bot = None
+
+def count_fsm_sessions() -> int:
+    if storage is None:
+        return 0
+    if isinstance(storage, SQLiteStorage):
+        return storage.count_sessions()
+    return sum(1 for record in storage.storage.values() if record.state is not None)
+
+
+FSM_SESSIONS = metrics.gauge(
+    "bot_fsm_sessions", "Активные FSM-сессии",
+    callback=count_fsm_sessions
+)
+
+# ==================== FACTORY ====================
+def setup_dispatcher():
+    from team_bot.handlers import setup_routers
+
+    dp.update.outer_middleware(UpdateMetricsMiddleware())
+    dp.message.middleware(PerfMiddleware())
+    dp.callback_query.middleware(PerfMiddleware())
+    bot.session.middleware(ApiTimingMiddleware())
+    bot.session.middleware(ApiMetricsMiddleware())
+    setup_routers(dp)
+
+def create_app(session=None):
+    # Фабрика приложения: Bot, хранилище FSM и Dispatcher создаются
+    # один раз по требованию, а не при импорте модуля
+    global bot, dp, storage
+    if dp is not None:
+        return bot, dp
+    if not BOT_TOKEN:
+        raise RuntimeError("BOT_TOKEN не задан")
+    storage = SQLiteStorage(DB_NAME) if FSM_STORAGE == "sqlite" else MemoryStorage()
+    dp = Dispatcher(storage=storage)
+    bot = Bot(token=BOT_TOKEN, session=session or TelegramSession())
+    setup_dispatcher()
+    return bot, dp
+
+async def warm_up():
+    # Параллельно прогреваем то, что иначе ждал бы первый апдейт:
+    # профиль бота, кэш админов, страницы индексов БД, соединение FSM
+    started = time.perf_counter()
+    jobs = [bot.me(), refresh_admins_cache(), get_stats()]
+    if isinstance(storage, SQLiteStorage):
+        jobs.append(storage.execute("SELECT 1"))
+    results = await asyncio.gather(*jobs, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            logging.warning("Warm-up: %s", result)
+    logging.info("Warm-up done in %.0f ms", (time.perf_counter() - started) * 1000)
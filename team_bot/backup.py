@@ -0,0 +1,48 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+from team_bot.config import (
+    BACKUP_DIR, BACKUP_KEEP, BACKUP_PAGES, BACKUP_STEP_SLEEP, DB_NAME, DB_TIMEOUT
+)
+
+
+def rotate_backups(prefix: str):
+    snapshots = sorted(
+        name for name in os.listdir(BACKUP_DIR)
+        if name.startswith(prefix) and name.endswith(".db")
+    )
+    for name in snapshots[:-BACKUP_KEEP]:
+        os.remove(os.path.join(BACKUP_DIR, name))
+
+def backup_database():
+    # Онлайн-бэкап через SQLite backup API: копирование шагами по BACKUP_PAGES
+    # страниц с паузами, писатели между шагами не блокируются.
+    # Выполняется в отдельном потоке (asyncio.to_thread)
+    started = time.perf_counter()
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    prefix = os.path.splitext(os.path.basename(DB_NAME))[0] + "_"
+    target = os.path.join(BACKUP_DIR, f"{prefix}{datetime.now():%Y%m%d_%H%M%S}.db")
+    partial = target + ".part"
+    
+    source = sqlite3.connect(DB_NAME, timeout=DB_TIMEOUT)
+    destination = sqlite3.connect(partial)
+    try:
+        source.backup(destination, pages=BACKUP_PAGES, sleep=BACKUP_STEP_SLEEP)
+    finally:
+        destination.close()
+        source.close()
+    os.replace(partial, target)
+    rotate_backups(prefix)
+    return {
+        "path": target,
+        "size": os.path.getsize(target),
+        "duration": time.perf_counter() - started
+    }
+
+async def scheduled_backup():
+    result = await asyncio.to_thread(backup_database)
+    logging.info("Backup %s: %d bytes in %.1fs", result["path"], result["size"], result["duration"])
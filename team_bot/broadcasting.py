@@ -0,0 +1,163 @@
+import asyncio
+import heapq
+import logging
+import time
+
+from aiogram.exceptions import TelegramAPIError
+
+from team_bot import app
+from team_bot.config import BROADCAST_DELAY, SCHEDULE_SYNC_INTERVAL
+from team_bot.db import (
+    claim_scheduled_run, get_all_approved_users, get_scheduled_broadcast, get_scheduled_broadcasts,
+    get_segment_users, mark_undeliverable, record_rollups, save_broadcast
+)
+from team_bot.helpers import run_in_background
+from team_bot.metrics import BROADCAST_QUEUE_DEPTH
+from team_bot.session import is_permanent_error
+
+
+# ==================== PAYLOAD ====================
+class BroadcastPayload:
+    # Копия исходного сообщения админа: любой тип контента, подписи и
+    # форматирование сохраняются, альбом уходит одной группой
+    def __init__(self, from_chat_id: int, message_ids: list, content_type: str, content: str):
+        self.from_chat_id = from_chat_id
+        self.message_ids = message_ids
+        self.content_type = content_type
+        self.content = content
+
+    @classmethod
+    def from_messages(cls, messages: list):
+        messages = sorted(messages, key=lambda m: m.message_id)
+        return cls(
+            messages[0].chat.id,
+            [m.message_id for m in messages],
+            "album" if len(messages) > 1 else messages[0].content_type,
+            next((m.text or m.caption for m in messages if m.text or m.caption), "")
+        )
+
+    async def send(self, chat_id: int) -> list:
+        if len(self.message_ids) == 1:
+            sent = await app.bot.copy_message(chat_id, self.from_chat_id, self.message_ids[0])
+            return [sent.message_id]
+        sent = await app.bot.copy_messages(chat_id, self.from_chat_id, self.message_ids)
+        return [m.message_id for m in sent]
+
+# ==================== PIPELINE ====================
+# Рассылки — немедленные и по расписанию — идут строго по одной: совпавшие
+# по времени встают в очередь, а не делят между собой лимит Telegram
+broadcast_lock = asyncio.Lock()
+
+async def deliver_broadcast(payload: BroadcastPayload, status_msg=None, segment: dict = None) -> dict:
+    async with broadcast_lock:
+        users = await get_segment_users(segment) if segment else await get_all_approved_users()
+        result = {"total": len(users), "success": 0, "failed": 0, "unreachable": 0}
+        sent_message_ids = []
+        unreachable = []
+
+        pending = len(users)
+        BROADCAST_QUEUE_DEPTH.inc(pending)
+        try:
+            for i, user in enumerate(users, 1):
+                try:
+                    sent_ids = await payload.send(user['user_id'])
+                    sent_message_ids.extend(f"{user['user_id']}:{msg_id}" for msg_id in sent_ids)
+                    result["success"] += 1
+                except TelegramAPIError as e:
+                    result["failed"] += 1
+                    if is_permanent_error(e):
+                        unreachable.append(user['user_id'])
+                    else:
+                        logging.warning("Broadcast to %s failed: %s", user['user_id'], e)
+
+                if status_msg is not None and i % 10 == 0:
+                    await status_msg.edit_text(f"📤 Отправка... {i}/{len(users)}")
+
+                pending -= 1
+                BROADCAST_QUEUE_DEPTH.dec()
+                await asyncio.sleep(BROADCAST_DELAY)
+        finally:
+            BROADCAST_QUEUE_DEPTH.dec(pending)
+
+        if sent_message_ids:
+            await save_broadcast(sent_message_ids, payload.content_type, payload.content[:200])
+        if unreachable:
+            await mark_undeliverable(unreachable)
+        result["unreachable"] = len(unreachable)
+        await record_rollups({"broadcast_sent": result["success"], "broadcast_failed": result["failed"]})
+    return result
+
+def format_broadcast_report(result: dict) -> str:
+    return (
+        f"✅ Рассылка завершена!\n\n"
+        f"✅ Успешно: {result['success']}\n"
+        f"❌ Ошибок: {result['failed']}\n"
+        f"🚷 Недоступны (исключены из рассылок): {result['unreachable']}"
+    )
+
+# ==================== SCHEDULED ====================
+def next_run(run_at: float, interval: int, now: float) -> float:
+    # Пропущенные за время простоя повторы не догоняем — только ближайший в будущем
+    missed = max(0, int((now - run_at) // interval))
+    return run_at + (missed + 1) * interval
+
+class BroadcastTimers:
+    # Таймеры отложенных рассылок: куча (время, id) и одна задача, которая спит
+    # до ближайшего срока. Таблица читается при старте и раз в sync_interval,
+    # чтобы подхватить рассылки, созданные в других воркерах.
+    # Работает у лидера планировщика
+    def __init__(self, sync_interval: float = SCHEDULE_SYNC_INTERVAL):
+        self.sync_interval = sync_interval
+        self.heap = []
+        self.wakeup = asyncio.Event()
+
+    def add(self, job_id: int, run_at: float):
+        heapq.heappush(self.heap, (run_at, job_id))
+        self.wakeup.set()
+
+    async def reload(self):
+        self.heap = [(job["next_run_at"], job["id"]) for job in await get_scheduled_broadcasts()]
+        heapq.heapify(self.heap)
+
+    async def run(self):
+        synced = 0
+        while True:
+            now = time.time()
+            if now - synced >= self.sync_interval:
+                await self.reload()
+                synced = now
+            self.wakeup.clear()
+            while self.heap and self.heap[0][0] <= now:
+                run_at, job_id = heapq.heappop(self.heap)
+                run_in_background(self.fire(job_id, run_at))
+            timeout = synced + self.sync_interval - now
+            if self.heap:
+                timeout = min(timeout, self.heap[0][0] - now)
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def fire(self, job_id: int, run_at: float):
+        job = await get_scheduled_broadcast(job_id)
+        if job is None or job["next_run_at"] != run_at:
+            return
+        next_run_at = None
+        if job["repeat_interval"]:
+            next_run_at = next_run(run_at, job["repeat_interval"], time.time())
+        if not await claim_scheduled_run(job_id, run_at, next_run_at):
+            return
+        if next_run_at is not None:
+            self.add(job_id, next_run_at)
+
+        payload = BroadcastPayload(job["from_chat_id"], job["message_ids"], job["content_type"], job["content"])
+        result = await deliver_broadcast(payload)
+        try:
+            await app.bot.send_message(
+                job["created_by"], f"⏰ Отложенная рассылка #{job_id}\n\n{format_broadcast_report(result)}"
+            )
+        except TelegramAPIError as e:
+            logging.warning("Scheduled broadcast %s report failed: %s", job_id, e)
+
+
+broadcast_timers = BroadcastTimers()
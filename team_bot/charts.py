@@ -0,0 +1,79 @@
+import struct
+import zlib
+
+# Графики для админки без внешних зависимостей: растр RGB в bytearray
+# и PNG-кодирование через zlib. Подписи — в тексте сообщения, не на картинке
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+BACKGROUND = (255, 255, 255)
+PANEL_BACKGROUND = (246, 247, 249)
+GRID = (222, 225, 230)
+
+
+def png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+class Canvas:
+    def __init__(self, width: int, height: int, background: tuple = BACKGROUND):
+        self.width = width
+        self.height = height
+        self.pixels = bytearray(bytes(background) * width * height)
+
+    def fill_rect(self, x0: int, y0: int, x1: int, y1: int, color: tuple):
+        # Прямоугольник [x0, x1) x [y0, y1), обрезается по краям холста
+        x0, x1 = max(0, x0), min(self.width, x1)
+        y0, y1 = max(0, y0), min(self.height, y1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        row = bytes(color) * (x1 - x0)
+        for y in range(y0, y1):
+            start = (y * self.width + x0) * 3
+            self.pixels[start:start + len(row)] = row
+
+    def to_png(self) -> bytes:
+        # Каждая строка с фильтром 0 (None), 8 бит на канал, RGB
+        stride = self.width * 3
+        raw = b"".join(
+            b"\x00" + self.pixels[y * stride:(y + 1) * stride] for y in range(self.height)
+        )
+        header = struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0)
+        return (
+            PNG_SIGNATURE
+            + png_chunk(b"IHDR", header)
+            + png_chunk(b"IDAT", zlib.compress(raw, 6))
+            + png_chunk(b"IEND", b"")
+        )
+
+def render_bar_panels(panels: list, peaks: list = None, width: int = 900, panel_height: int = 150,
+                      margin: int = 12) -> bytes:
+    # panels: [[(значения по дням, цвет), ...], ...] — панель на строку,
+    # серии одной панели стоят рядом внутри дня и делят общий масштаб.
+    # peaks: фиксированный максимум шкалы на панель (None — по данным)
+    height = margin + len(panels) * (panel_height + margin)
+    canvas = Canvas(width, height)
+    plot_width = width - 2 * margin
+    for index, series in enumerate(panels):
+        top = margin + index * (panel_height + margin)
+        bottom = top + panel_height
+        canvas.fill_rect(margin, top, margin + plot_width, bottom, PANEL_BACKGROUND)
+        for quarter in (1, 2, 3):
+            y = bottom - panel_height * quarter // 4
+            canvas.fill_rect(margin, y, margin + plot_width, y + 1, GRID)
+
+        days = max(len(values) for values, _ in series)
+        peak = (peaks[index] if peaks else None) or max(
+            (value for values, _ in series for value in values if value), default=0
+        )
+        if not days or peak <= 0:
+            continue
+        slot = plot_width / days
+        bar = max(1, int(slot * 0.8 / len(series)))
+        for day in range(days):
+            x = margin + int(day * slot + slot * 0.1)
+            for values, color in series:
+                value = values[day] if day < len(values) else None
+                if value and value > 0:
+                    bar_height = max(1, round(value / peak * (panel_height - 4)))
+                    canvas.fill_rect(x, bottom - bar_height, x + bar, bottom, color)
+                x += bar
+    return canvas.to_png()
@@ -0,0 +1,86 @@
+import os
+
+BOT_TOKEN = os.getenv("BOT_TOKEN")  # токен берется из переменной окружения
+ADMIN_IDS = [8343231096]            # главный админ
+ADMIN_GROUP_ID = -1003692051473     # ID группы админ-панели
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+PERF_ENABLED = os.getenv("PERF_ENABLED", "0") == "1"  # профилирование хендлеров
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))  # 0 — не поднимать /metrics
+ADMINS_CACHE_TTL = 30                                 # сек, кэш списка админов из БД
+API_POOL_LIMIT = int(os.getenv("API_POOL_LIMIT", "100"))  # соединений к api.telegram.org
+API_MAX_RETRIES = 3                                   # повторов на RetryAfter / 5xx
+API_MAX_RETRY_AFTER = 60                              # сек, дольше flood wait не ждём
+DB_NAME = os.getenv("DB_NAME", "team_bot.db")
+DB_TIMEOUT = 30                                       # сек, ожидание блокировки SQLite
+FSM_STORAGE = os.getenv("FSM_STORAGE", "memory")      # memory | sqlite (общее для воркеров)
+WORKERS = int(os.getenv("WORKERS", "1"))              # >1 — супервизор с воркерами
+WORKER_CONCURRENCY = 100                              # апдейтов одновременно на воркер
+LEASE_TTL = 10                                        # сек, аренда лидера фоновых задач
+LEASE_RENEW_INTERVAL = 3                              # сек, продление аренды
+FSM_SWEEP_INTERVAL = 600                              # сек, чистка пустых FSM-записей
+SEEN_ACTIONS_LIMIT = 10000                            # запоминаемых нажатий админских кнопок
+DELETE_CONCURRENCY = 5                                # одновременных delete_message в запасном режиме
+BROADCAST_DELAY = float(os.getenv("BROADCAST_DELAY", "0.05"))  # сек, пауза между отправками рассылки
+SCHEDULE_SYNC_INTERVAL = 60                           # сек, перечитывание отложенных рассылок из БД
+# Варианты повтора отложенной рассылки: callback-ключ -> (подпись, интервал в секундах)
+SCHEDULE_REPEATS = {
+    "once": ("Однократно", None),
+    "hour": ("Каждый час", 3600),
+    "day": ("Каждый день", 86400),
+    "week": ("Каждую неделю", 7 * 86400)
+}
+NOTIFY_RATE = 25                                      # уведомлений в секунду (лимит Telegram ~30)
+OUTBOX_BATCH = 100                                    # уведомлений outbox за одну выборку
+OUTBOX_POLL_INTERVAL = 2                              # сек, проверка outbox без явного пробуждения
+OUTBOX_CLAIM_TTL = 120                                # сек, через сколько невыполненная выборка снова доступна
+OUTBOX_MAX_BACKOFF = 600                              # сек, потолок паузы между повторами
+OUTBOX_MAX_ATTEMPTS = 20                              # попыток (~2 ч с паузами), потом уведомление снимается
+DIGEST_THRESHOLD = 10                                 # заявок в минуту, выше — в группу админов идут дайджесты
+DIGEST_WINDOW = 5                                     # сек, сколько копить заявки для одного дайджеста
+DIGEST_MAX_ITEMS = 10                                 # заявок в одном дайджесте
+DIGEST_HEADER = "📨 НОВЫЕ ЗАЯВКИ"
+BULK_PAGE_SIZE = 10                                   # заявок на странице массовой обработки
+BULK_IMPORT_MAX_SIZE = 5 * 1024 * 1024                # байт, файл импорта профитов
+EXPORT_CHUNK_SIZE = 5000                              # строк за одно чтение при выгрузке
+BACKUP_DIR = os.getenv("BACKUP_DIR", "backups")
+BACKUP_KEEP = int(os.getenv("BACKUP_KEEP", "7"))      # сколько снапшотов хранить
+BACKUP_INTERVAL = int(os.getenv("BACKUP_INTERVAL", str(6 * 3600)))  # сек, 0 — без расписания
+BACKUP_PAGES = 1024                                   # страниц БД за один шаг бэкапа
+BACKUP_STEP_SLEEP = 0.005                             # сек, пауза между шагами
+SCHEMA_VERSION = 8                                    # PRAGMA user_version; поднять при смене схемы
+CHART_PERIODS = (7, 30, 90)                           # дней на графиках аналитики
+CHART_CACHE_TTL = 600                                 # сек, готовый график периода переиспользуется
+REVIEW_PAGE_SIZE = 5                                  # заявок на странице очереди рассмотрения
+THROTTLE_TTL = 300                                    # сек, бакеты неактивных пользователей удаляются
+TON_ADDRESS_CACHE_SIZE = 4096                         # разобранных адресов в LRU-кэше
+WALLET_CHECK_INTERVAL = 24 * 3600                     # сек, перепроверка всех сохранённых кошельков
+WALLET_CHECK_CHUNK = 1000                             # кошельков за одно чтение при перепроверке
+
+# Антифлуд по группам хендлеров (флаг throttle):
+# (токенов в секунду, запас, сколько секунд апдейт может ждать токен).
+# Не дождался — апдейт отбрасывается. Группы без записи не ограничиваются
+THROTTLE_RATES = {
+    "default": (2.0, 10, 0.5),
+    "start": (0.2, 3, 0),
+    "profile": (0.5, 3, 0.5),
+    "apply": (0.1, 3, 0)
+}
+
+
+# Вопросы анкеты: поле (колонка таблицы applications) -> текст вопроса
+APPLICATION_QUESTIONS = {
+    "source": "Откуда вы узнали о команде",
+    "experience": "Какой у вас опыт в данной сфере",
+    "availability": "Сколько времени вы готовы уделять работе",
+    "motivation": "Почему мы должны взять вас в команду"
+}
+
+# Ссылки на ресурсы
+RESOURCES_LINKS = {
+    "chat": "https://t.me/+36dQ6mR6FcVjYTdi",
+    "payments": "https://t.me/+T8U1uXPvrnw1Mzgy",
+    "logs": "https://t.me/+KxYSRT3Ut4ZlNTcy",
+    "updates": "https://t.me/+Wzf_xOx-CMk5M2Yy"
+}
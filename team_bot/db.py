@@ -0,0 +1,807 @@
+import json
+import math
+import re
+import time
+from contextlib import asynccontextmanager
+
+import aiosqlite
+
+from team_bot.config import (
+    ADMIN_IDS, ADMINS_CACHE_TTL, APPLICATION_QUESTIONS, BULK_PAGE_SIZE, DB_NAME, DB_TIMEOUT, SCHEMA_VERSION
+)
+from team_bot.metrics import CACHE_REQUESTS_TOTAL, DB_QUERY_SECONDS
+from team_bot.profiling import perf_context
+
+DB_TRACE = None  # callback(sql) для отладки и проверки планов запросов (benchmarks/db.py)
+
+@asynccontextmanager
+async def connect_db():
+    ctx = perf_context.get()
+    started = time.perf_counter_ns()
+    try:
+        async with aiosqlite.connect(DB_NAME, timeout=DB_TIMEOUT) as db:
+            if DB_TRACE is not None:
+                await db.set_trace_callback(DB_TRACE)
+            yield db
+    finally:
+        elapsed = time.perf_counter_ns() - started
+        DB_QUERY_SECONDS.observe(elapsed / 1e9)
+        if ctx is not None:
+            ctx[0] += elapsed
+
+async def ensure_column(db, table: str, column: str, definition: str):
+    async with db.execute(f"PRAGMA table_info({table})") as cursor:
+        columns = [r[1] for r in await cursor.fetchall()]
+    if column not in columns:
+        await db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+async def init_db():
+    async with connect_db() as db:
+        # Схема уже актуальна — на рестарте не гоняем DDL
+        async with db.execute("PRAGMA user_version") as cursor:
+            if (await cursor.fetchone())[0] >= SCHEMA_VERSION:
+                return
+        # WAL: читатели не блокируют писателя, база общая для нескольких процессов
+        await db.execute("PRAGMA journal_mode=WAL")
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS users (
+                user_id INTEGER PRIMARY KEY,
+                username TEXT,
+                nickname TEXT,
+                status TEXT DEFAULT 'pending',
+                percent INTEGER DEFAULT 65,
+                profits_count INTEGER DEFAULT 0,
+                profits_sum REAL DEFAULT 0.0,
+                wallet TEXT,
+                application_data TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                deliverable INTEGER DEFAULT 1,
+                last_failure_at TIMESTAMP
+            )
+        """)
+        await ensure_column(db, "users", "deliverable", "INTEGER DEFAULT 1")
+        await ensure_column(db, "users", "last_failure_at", "TIMESTAMP")
+        # Ставит перепроверка кошельков (scheduler.revalidate_wallets), сбрасывает update_wallet
+        await ensure_column(db, "users", "wallet_invalid", "INTEGER DEFAULT 0")
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS broadcasts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                message_ids TEXT,
+                content_type TEXT,
+                content TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS admins (
+                admin_id INTEGER PRIMARY KEY
+            )
+        """)
+        # Индексы под горячие запросы; планы проверяет benchmarks/db.py
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_users_username ON users (username COLLATE NOCASE)"
+        )
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_users_audience ON users (status, deliverable, username)"
+        )
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_users_status_created ON users (status, created_at)"
+        )
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_users_status_profits ON users (status, profits_sum)"
+        )
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_users_status_percent ON users (status, percent)"
+        )
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_broadcasts_created ON broadcasts (created_at)"
+        )
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS leases (
+                name TEXT PRIMARY KEY,
+                holder TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        # Время последнего запуска периодических задач планировщика — переживает
+        # рестарты и смену лидера
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS job_runs (
+                name TEXT PRIMARY KEY,
+                last_run_at REAL NOT NULL
+            )
+        """)
+        # Уведомления пишутся сюда в одной транзакции с изменением, отправляет OutboxSender
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                chat_id INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                markup TEXT,
+                attempts INTEGER DEFAULT 0,
+                next_attempt_at REAL DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_outbox_next_attempt ON outbox (next_attempt_at)"
+        )
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS scheduled_broadcasts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                from_chat_id INTEGER NOT NULL,
+                message_ids TEXT NOT NULL,
+                content_type TEXT,
+                content TEXT,
+                next_run_at REAL NOT NULL,
+                repeat_interval INTEGER,
+                created_by INTEGER,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_scheduled_next_run ON scheduled_broadcasts (next_run_at)"
+        )
+        # Анкеты — отдельной строкой на каждую подачу; статус повторяет
+        # решение по пользователю, очередь рассмотрения идёт по (status, submitted_at)
+        await db.execute(f"""
+            CREATE TABLE IF NOT EXISTS applications (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                {", ".join(f"{field} TEXT" for field in APPLICATION_QUESTIONS)},
+                status TEXT DEFAULT 'pending',
+                submitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                reviewed_at TIMESTAMP
+            )
+        """)
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_applications_status_submitted ON applications (status, submitted_at)"
+        )
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_applications_user ON applications (user_id, status)"
+        )
+        await migrate_legacy_applications(db)
+        # Дневные счётчики для графиков: пишутся хелперами ниже в тех же
+        # транзакциях, что и сами изменения, сырые таблицы для графиков не читаются
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS stats_daily (
+                day TEXT NOT NULL,
+                metric TEXT NOT NULL,
+                value REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, metric)
+            ) WITHOUT ROWID
+        """)
+        await backfill_rollups(db)
+        await db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        await db.commit()
+
+async def migrate_legacy_applications(db):
+    # Заявки на рассмотрении, поданные до таблицы applications, хранились
+    # текстом "вопрос: ответ" в users.application_data — разбираем в поля
+    async with db.execute("""
+        SELECT user_id, application_data, created_at FROM users
+        WHERE status = 'pending' AND NOT EXISTS (
+            SELECT 1 FROM applications WHERE applications.user_id = users.user_id
+        )
+    """) as cursor:
+        rows = await cursor.fetchall()
+    labels = {label: field for field, label in APPLICATION_QUESTIONS.items()}
+    fields = list(APPLICATION_QUESTIONS)
+    entries = []
+    for user_id, text, created_at in rows:
+        answers = {}
+        for line in (text or "").splitlines():
+            label, _, answer = line.partition(": ")
+            if label in labels:
+                answers[labels[label]] = answer
+        entries.append((user_id, *(answers.get(field) for field in fields), created_at))
+    await db.executemany(f"""
+        INSERT INTO applications (user_id, {", ".join(fields)}, submitted_at)
+        VALUES (?, {", ".join("?" * len(fields))}, ?)
+    """, entries)
+
+async def backfill_rollups(db):
+    # Первое заполнение при миграции: заявки и решения по ним из applications
+    async with db.execute("SELECT 1 FROM stats_daily LIMIT 1") as cursor:
+        if await cursor.fetchone():
+            return
+    await db.execute("""
+        INSERT INTO stats_daily (day, metric, value)
+        SELECT date(submitted_at), 'applications', COUNT(*) FROM applications GROUP BY 1
+    """)
+    await db.execute("""
+        INSERT INTO stats_daily (day, metric, value)
+        SELECT date(reviewed_at), status, COUNT(*) FROM applications
+        WHERE reviewed_at IS NOT NULL AND status IN ('approved', 'rejected', 'banned')
+        GROUP BY 1, 2
+    """)
+
+# Статусы, при которых новая заявка не принимается: решение по пользователю уже есть
+APPLY_CLOSED_STATUSES = ("approved", "banned", "rejected")
+
+async def save_application(user_id: int, username: str, answers: dict) -> bool:
+    # answers: поле из APPLICATION_QUESTIONS -> ответ. Пользователь обновляется
+    # upsert'ом: профиты, процент и кошелёк при повторной подаче сохраняются.
+    # Повторно подать можно только из pending; False — заявка не принята
+    fields = list(APPLICATION_QUESTIONS)
+    async with connect_db() as db:
+        cursor = await db.execute(f"""
+            INSERT INTO users (user_id, username, status) VALUES (?, ?, 'pending')
+            ON CONFLICT(user_id) DO UPDATE SET username = excluded.username, status = 'pending'
+            WHERE users.status NOT IN ({", ".join("?" * len(APPLY_CLOSED_STATUSES))})
+        """, (user_id, username, *APPLY_CLOSED_STATUSES))
+        if not cursor.rowcount:
+            return False
+        await db.execute(
+            "UPDATE applications SET status = 'superseded' WHERE user_id = ? AND status = 'pending'",
+            (user_id,)
+        )
+        await db.execute(f"""
+            INSERT INTO applications (user_id, {", ".join(fields)})
+            VALUES (?, {", ".join("?" * len(fields))})
+        """, (user_id, *(answers.get(field) for field in fields)))
+        await bump_rollups(db, {"applications": 1})
+        await db.commit()
+    return True
+
+async def get_user(user_id: int):
+    async with connect_db() as db:
+        async with db.execute(
+            "SELECT * FROM users WHERE user_id = ?", (user_id,)
+        ) as cursor:
+            row = await cursor.fetchone()
+            if row:
+                return {
+                    "user_id": row[0],
+                    "username": row[1],
+                    "nickname": row[2],
+                    "status": row[3],
+                    "percent": row[4],
+                    "profits_count": row[5],
+                    "profits_sum": row[6],
+                    "wallet": row[7],
+                    "application_data": row[8],
+                    "deliverable": bool(row[10])
+                }
+    return None
+
+async def update_user_status(user_id: int, status: str):
+    async with connect_db() as db:
+        await db.execute(
+            "UPDATE users SET status = ? WHERE user_id = ?", (status, user_id)
+        )
+        await db.commit()
+
+async def change_user_status(user_id: int, status: str, expected: tuple,
+                             notice: str = None, markup: str = None) -> bool:
+    # Условный переход: меняет статус, только если текущий входит в expected.
+    # False — переход уже выполнен кем-то другим (второй клик, другой админ/воркер).
+    # notice ставится в outbox той же транзакцией, только если статус сменился
+    placeholders = ", ".join("?" * len(expected))
+    async with connect_db() as db:
+        cursor = await db.execute(
+            f"UPDATE users SET status = ? WHERE user_id = ? AND status IN ({placeholders})",
+            (status, user_id, *expected)
+        )
+        changed = cursor.rowcount > 0
+        if changed:
+            await close_applications(db, [user_id], status)
+            await bump_rollups(db, {status: 1})
+        if changed and notice:
+            await enqueue_notices(db, [(user_id, notice, markup)])
+        await db.commit()
+        return changed
+
+async def update_nickname(user_id: int, nickname: str):
+    async with connect_db() as db:
+        await db.execute(
+            "UPDATE users SET nickname = ? WHERE user_id = ?", (nickname, user_id)
+        )
+        await db.commit()
+
+async def update_wallet(user_id: int, wallet: str):
+    async with connect_db() as db:
+        await db.execute(
+            "UPDATE users SET wallet = ?, wallet_invalid = 0 WHERE user_id = ?", (wallet, user_id)
+        )
+        await db.commit()
+
+async def add_profit(user_id: int, amount: float, notice: str = None):
+    async with connect_db() as db:
+        cursor = await db.execute("""
+            UPDATE users 
+            SET profits_sum = profits_sum + ?, 
+                profits_count = profits_count + 1 
+            WHERE user_id = ?
+        """, (amount, user_id))
+        if cursor.rowcount:
+            await bump_rollups(db, {"profits": amount, "profit_count": 1})
+        if cursor.rowcount and notice:
+            await enqueue_notices(db, [(user_id, notice, None)])
+        await db.commit()
+
+async def remove_profit(user_id: int, amount: float):
+    async with connect_db() as db:
+        cursor = await db.execute("""
+            UPDATE users 
+            SET profits_sum = CASE 
+                WHEN profits_sum - ? < 0 THEN 0 
+                ELSE profits_sum - ? 
+            END,
+                profits_count = CASE 
+                WHEN profits_count - 1 < 0 THEN 0 
+                ELSE profits_count - 1 
+            END
+            WHERE user_id = ?
+        """, (amount, amount, user_id))
+        if cursor.rowcount:
+            await bump_rollups(db, {"profits": -amount, "profit_count": -1})
+        await db.commit()
+
+def chunked(items: list, size: int = 500):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+async def close_applications(db, user_ids: list, status: str):
+    # Без commit: решение по заявке пишется в транзакции смены статуса пользователя
+    await db.executemany("""
+        UPDATE applications SET status = ?, reviewed_at = CURRENT_TIMESTAMP
+        WHERE user_id = ? AND status = 'pending'
+    """, [(status, user_id) for user_id in user_ids])
+
+async def get_pending_page(page: int, page_size: int = BULK_PAGE_SIZE):
+    # Одна страница очереди: COUNT и выборка идут по idx_applications_status_submitted
+    fields = list(APPLICATION_QUESTIONS)
+    async with connect_db() as db:
+        async with db.execute("SELECT COUNT(*) FROM applications WHERE status = 'pending'") as cursor:
+            total = (await cursor.fetchone())[0]
+        async with db.execute(f"""
+            SELECT a.user_id, u.username, a.submitted_at, {", ".join(f"a.{field}" for field in fields)}
+            FROM applications a JOIN users u ON u.user_id = a.user_id
+            WHERE a.status = 'pending'
+            ORDER BY a.submitted_at, a.id LIMIT ? OFFSET ?
+        """, (page_size, page * page_size)) as cursor:
+            rows = await cursor.fetchall()
+    return total, [
+        {
+            "user_id": r[0],
+            "username": r[1],
+            "submitted_at": r[2],
+            "answers": {field: answer for field, answer in zip(fields, r[3:]) if answer is not None}
+        }
+        for r in rows
+    ]
+
+async def bulk_change_status(user_ids: list, status: str, expected: tuple,
+                             notice: str = None, markup: str = None) -> list:
+    # Одна транзакция на всю пачку; возвращает id, у которых статус реально сменился
+    placeholders = ", ".join("?" * len(expected))
+    changed = []
+    async with connect_db() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        for chunk in chunked(user_ids):
+            async with db.execute(
+                f"SELECT user_id FROM users WHERE user_id IN ({', '.join('?' * len(chunk))}) "
+                f"AND status IN ({placeholders})",
+                (*chunk, *expected)
+            ) as cursor:
+                changed.extend(r[0] for r in await cursor.fetchall())
+        await db.executemany(
+            "UPDATE users SET status = ? WHERE user_id = ?",
+            [(status, user_id) for user_id in changed]
+        )
+        await close_applications(db, changed, status)
+        await bump_rollups(db, {status: len(changed)})
+        if notice:
+            await enqueue_notices(db, [(user_id, notice, markup) for user_id in changed])
+        await db.commit()
+    return changed
+
+async def bulk_add_profits(entries: list, notice: str = None) -> list:
+    # entries: [(user_id, amount)]; начисляет всё одной транзакцией,
+    # возвращает записи для существующих пользователей.
+    # notice — шаблон уведомления с {amount}
+    user_ids = list({user_id for user_id, _ in entries})
+    known = set()
+    async with connect_db() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        for chunk in chunked(user_ids):
+            async with db.execute(
+                f"SELECT user_id FROM users WHERE user_id IN ({', '.join('?' * len(chunk))})", chunk
+            ) as cursor:
+                known.update(r[0] for r in await cursor.fetchall())
+        applied = [(user_id, amount) for user_id, amount in entries if user_id in known]
+        await db.executemany("""
+            UPDATE users
+            SET profits_sum = profits_sum + ?,
+                profits_count = profits_count + 1
+            WHERE user_id = ?
+        """, [(amount, user_id) for user_id, amount in applied])
+        await bump_rollups(db, {
+            "profits": sum(amount for _, amount in applied), "profit_count": len(applied)
+        })
+        if notice:
+            await enqueue_notices(db, [
+                (user_id, notice.format(amount=amount), None) for user_id, amount in applied
+            ])
+        await db.commit()
+    return applied
+
+async def update_percent(user_id: int, percent: int, notice: str = None):
+    async with connect_db() as db:
+        cursor = await db.execute(
+            "UPDATE users SET percent = ? WHERE user_id = ?", (percent, user_id)
+        )
+        if cursor.rowcount and notice:
+            await enqueue_notices(db, [(user_id, notice, None)])
+        await db.commit()
+
+async def find_user_by_username(username: str):
+    # Точное совпадение без учёта регистра, иначе — по началу ника; оба
+    # варианта идут по idx_users_username. Если ничего не нашлось — поиск по
+    # подстроке, как раньше: это полный проход, он разрешён в benchmarks/db.py
+    # только для этого запасного шага
+    username = username.lstrip('@')
+    escaped = re.sub(r"([\\%_])", r"\\\1", username)
+    pattern = escaped + "%"
+    async with connect_db() as db:
+        async with db.execute(
+            "SELECT * FROM users WHERE username = ? COLLATE NOCASE", (username,)
+        ) as cursor:
+            row = await cursor.fetchone()
+        if not row:
+            async with db.execute(
+                "SELECT * FROM users WHERE username LIKE ? ESCAPE '\\' ORDER BY username COLLATE NOCASE LIMIT 1",
+                (pattern,)
+            ) as cursor:
+                row = await cursor.fetchone()
+        if not row:
+            async with db.execute(
+                "SELECT * FROM users WHERE username LIKE ? ESCAPE '\\' LIMIT 1", (f"%{escaped}%",)
+            ) as cursor:
+                row = await cursor.fetchone()
+        if row:
+            return {
+                "user_id": row[0],
+                "username": row[1],
+                "nickname": row[2],
+                "status": row[3],
+                "percent": row[4],
+                "profits_count": row[5],
+                "profits_sum": row[6],
+                "wallet": row[7]
+            }
+    return None
+
+async def get_all_approved_users():
+    async with connect_db() as db:
+        async with db.execute(
+            "SELECT user_id, username, nickname FROM users "
+            "WHERE status = 'approved' AND deliverable = 1 ORDER BY username"
+        ) as cursor:
+            rows = await cursor.fetchall()
+            return [{"user_id": r[0], "username": r[1], "nickname": r[2]} for r in rows]
+
+# ==================== SEGMENTS ====================
+# Диапазоны сегмента: ключ -> (колонка, оператор верхней границы).
+# У даты верхняя граница — начало следующего дня, поэтому строгая
+SEGMENT_RANGES = {
+    "percent": ("percent", "<="),
+    "profits": ("profits_sum", "<="),
+    "joined": ("created_at", "<")
+}
+
+def compile_segment(segment: dict):
+    # Сегмент: {"statuses": [...], "percent": [от, до], "profits": [от, до],
+    # "joined": ["ГГГГ-ММ-ДД", "ГГГГ-ММ-ДД"], "wallet": True/False}, любая граница — None.
+    # Статус всегда задан, а под каждый диапазон есть индекс (status, колонка):
+    # SQLite берёт самый селективный из них, полного прохода по таблице нет
+    statuses = segment.get("statuses") or ["approved"]
+    clauses = [f"status IN ({', '.join('?' * len(statuses))})", "deliverable = 1"]
+    params = list(statuses)
+    for key, (column, upper) in SEGMENT_RANGES.items():
+        low, high = segment.get(key) or (None, None)
+        if low is not None:
+            clauses.append(f"{column} >= ?")
+            params.append(low)
+        if high is not None:
+            clauses.append(f"{column} {upper} ?")
+            params.append(high)
+    if segment.get("wallet") is True:
+        clauses.append("wallet IS NOT NULL AND wallet != ''")
+    elif segment.get("wallet") is False:
+        clauses.append("(wallet IS NULL OR wallet = '')")
+    return " AND ".join(clauses), params
+
+async def count_segment(segment: dict) -> int:
+    where, params = compile_segment(segment)
+    async with connect_db() as db:
+        async with db.execute(f"SELECT COUNT(*) FROM users WHERE {where}", params) as cursor:
+            return (await cursor.fetchone())[0]
+
+async def get_segment_users(segment: dict):
+    where, params = compile_segment(segment)
+    async with connect_db() as db:
+        async with db.execute(
+            f"SELECT user_id, username, nickname FROM users WHERE {where}", params
+        ) as cursor:
+            rows = await cursor.fetchall()
+            return [{"user_id": r[0], "username": r[1], "nickname": r[2]} for r in rows]
+
+async def get_payout_rows() -> list:
+    # Колонки для расчёта выплат одним запросом по idx_users_status_profits.
+    # Кошелёк, не прошедший перепроверку, отдаётся как отсутствующий
+    async with connect_db() as db:
+        async with db.execute("""
+            SELECT user_id, username, percent, profits_sum,
+                   CASE WHEN wallet_invalid THEN NULL ELSE wallet END
+            FROM users
+            WHERE status = 'approved' AND profits_sum > 0
+        """) as cursor:
+            return await cursor.fetchall()
+
+async def get_wallets_after(user_id: int, limit: int) -> list:
+    # Порция кошельков для перепроверки: keyset по первичному ключу, без OFFSET
+    async with connect_db() as db:
+        async with db.execute("""
+            SELECT user_id, wallet, wallet_invalid FROM users
+            WHERE user_id > ? AND wallet IS NOT NULL AND wallet != ''
+            ORDER BY user_id LIMIT ?
+        """, (user_id, limit)) as cursor:
+            return await cursor.fetchall()
+
+async def set_wallet_flags(flags: list):
+    # flags: [(wallet_invalid, user_id, wallet)]; кошелёк, сменённый за время
+    # проверки, не трогаем — его уже проверил хендлер привязки
+    async with connect_db() as db:
+        await db.executemany(
+            "UPDATE users SET wallet_invalid = ? WHERE user_id = ? AND wallet = ?", flags
+        )
+        await db.commit()
+
+async def mark_undeliverable(user_ids: list):
+    async with connect_db() as db:
+        await db.executemany(
+            "UPDATE users SET deliverable = 0, last_failure_at = CURRENT_TIMESTAMP WHERE user_id = ?",
+            [(user_id,) for user_id in user_ids]
+        )
+        await db.commit()
+
+async def mark_deliverable(user_id: int):
+    async with connect_db() as db:
+        await db.execute(
+            "UPDATE users SET deliverable = 1 WHERE user_id = ? AND deliverable = 0", (user_id,)
+        )
+        await db.commit()
+
+# ==================== ROLLUPS ====================
+async def bump_rollups(db, counters: dict):
+    # counters: метрика -> прибавка за сегодня (UTC); без commit — в транзакции вызывающего.
+    # nan/inf пропускаются: иначе NOT NULL на value или испорченный день на графиках
+    await db.executemany("""
+        INSERT INTO stats_daily (day, metric, value) VALUES (date('now'), ?, ?)
+        ON CONFLICT(day, metric) DO UPDATE SET value = value + excluded.value
+    """, [(metric, value) for metric, value in counters.items() if value and math.isfinite(value)])
+
+async def record_rollups(counters: dict):
+    async with connect_db() as db:
+        await bump_rollups(db, counters)
+        await db.commit()
+
+async def get_rollups(days: int) -> dict:
+    # {метрика: {"ГГГГ-ММ-ДД": значение}} за последние days дней, по первичному ключу
+    rollups = {}
+    async with connect_db() as db:
+        async with db.execute(
+            "SELECT day, metric, value FROM stats_daily WHERE day > date('now', ?)", (f"-{days} days",)
+        ) as cursor:
+            for day, metric, value in await cursor.fetchall():
+                rollups.setdefault(metric, {})[day] = value
+    return rollups
+
+# ==================== OUTBOX ====================
+async def enqueue_notices(db, notices: list):
+    # notices: [(chat_id, text, markup)]; без commit — пишется в транзакции вызывающего.
+    # markup — имя клавиатуры из notifications.OUTBOX_MARKUPS
+    await db.executemany(
+        "INSERT INTO outbox (chat_id, text, markup) VALUES (?, ?, ?)", notices
+    )
+
+async def claim_outbox(limit: int, claim_ttl: float) -> list:
+    # Забирает готовые к отправке записи, сдвигая их срок на claim_ttl: другой
+    # процесс их уже не возьмёт, а при падении отправителя они вернутся в очередь
+    now = time.time()
+    async with connect_db() as db:
+        async with db.execute("""
+            UPDATE outbox SET next_attempt_at = ?, attempts = attempts + 1
+            WHERE id IN (
+                SELECT id FROM outbox WHERE next_attempt_at <= ?
+                ORDER BY next_attempt_at LIMIT ?
+            )
+            RETURNING id, chat_id, text, markup, attempts
+        """, (now + claim_ttl, now, limit)) as cursor:
+            rows = await cursor.fetchall()
+        await db.commit()
+    rows.sort()
+    return [
+        {"id": r[0], "chat_id": r[1], "text": r[2], "markup": r[3], "attempts": r[4]}
+        for r in rows
+    ]
+
+async def finish_outbox(ids: list):
+    async with connect_db() as db:
+        for chunk in chunked(ids):
+            await db.execute(
+                f"DELETE FROM outbox WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+            )
+        await db.commit()
+
+async def retry_outbox(entry_id: int, delay: float):
+    async with connect_db() as db:
+        await db.execute(
+            "UPDATE outbox SET next_attempt_at = ? WHERE id = ?", (time.time() + delay, entry_id)
+        )
+        await db.commit()
+
+async def get_stats() -> dict:
+    # Каждый подсчёт — поиск по индексу на status, без прохода по таблице
+    stats = {}
+    async with connect_db() as db:
+        for status in ("pending", "approved", "rejected", "banned"):
+            async with db.execute("SELECT COUNT(*) FROM users WHERE status = ?", (status,)) as cursor:
+                stats[status] = (await cursor.fetchone())[0]
+        async with db.execute("SELECT SUM(profits_sum) FROM users WHERE status = 'approved'") as cursor:
+            stats["total_profits"] = (await cursor.fetchone())[0] or 0
+    return stats
+
+async def add_admin_to_db(admin_id: int):
+    async with connect_db() as db:
+        await db.execute("INSERT OR IGNORE INTO admins (admin_id) VALUES (?)", (admin_id,))
+        await db.commit()
+    invalidate_admins_cache()
+
+async def remove_admin_from_db(admin_id: int):
+    async with connect_db() as db:
+        await db.execute("DELETE FROM admins WHERE admin_id = ?", (admin_id,))
+        await db.commit()
+    invalidate_admins_cache()
+
+async def get_all_admins():
+    async with connect_db() as db:
+        async with db.execute("SELECT admin_id FROM admins") as cursor:
+            rows = await cursor.fetchall()
+            return [r[0] for r in rows]
+
+admins_cache = {"ids": frozenset(), "expires": 0.0}
+
+def invalidate_admins_cache():
+    admins_cache["expires"] = 0.0
+
+async def refresh_admins_cache():
+    admins_cache["ids"] = frozenset(await get_all_admins())
+    admins_cache["expires"] = time.monotonic() + ADMINS_CACHE_TTL
+
+async def is_admin(user_id: int) -> bool:
+    if user_id in ADMIN_IDS:
+        return True
+    if admins_cache["expires"] > time.monotonic():
+        CACHE_REQUESTS_TOTAL.inc(cache="admins", result="hit")
+    else:
+        CACHE_REQUESTS_TOTAL.inc(cache="admins", result="miss")
+        await refresh_admins_cache()
+    return user_id in admins_cache["ids"]
+
+async def save_broadcast(message_ids: list, content_type: str, content: str):
+    async with connect_db() as db:
+        await db.execute("""
+            INSERT INTO broadcasts (message_ids, content_type, content)
+            VALUES (?, ?, ?)
+        """, (json.dumps(message_ids), content_type, content))
+        await db.commit()
+
+async def get_all_broadcasts():
+    async with connect_db() as db:
+        async with db.execute(
+            "SELECT id, message_ids, content_type, content, created_at FROM broadcasts ORDER BY created_at DESC"
+        ) as cursor:
+            return [broadcast_from_row(r) for r in await cursor.fetchall()]
+
+def broadcast_from_row(r) -> dict:
+    return {
+        "id": r[0],
+        "message_ids": json.loads(r[1]),
+        "content_type": r[2],
+        "content": r[3],
+        "created_at": r[4]
+    }
+
+async def get_recent_broadcasts(limit: int = 10):
+    async with connect_db() as db:
+        async with db.execute(
+            "SELECT id, message_ids, content_type, content, created_at FROM broadcasts "
+            "ORDER BY created_at DESC LIMIT ?", (limit,)
+        ) as cursor:
+            return [broadcast_from_row(r) for r in await cursor.fetchall()]
+
+async def get_broadcast(broadcast_id: int):
+    async with connect_db() as db:
+        async with db.execute(
+            "SELECT id, message_ids, content_type, content, created_at FROM broadcasts WHERE id = ?",
+            (broadcast_id,)
+        ) as cursor:
+            row = await cursor.fetchone()
+    return broadcast_from_row(row) if row else None
+
+async def delete_broadcast_by_id(broadcast_id: int):
+    async with connect_db() as db:
+        await db.execute("DELETE FROM broadcasts WHERE id = ?", (broadcast_id,))
+        await db.commit()
+
+async def delete_all_broadcasts():
+    async with connect_db() as db:
+        await db.execute("DELETE FROM broadcasts")
+        await db.commit()
+
+# ==================== SCHEDULED BROADCASTS ====================
+def scheduled_from_row(r) -> dict:
+    return {
+        "id": r[0],
+        "from_chat_id": r[1],
+        "message_ids": json.loads(r[2]),
+        "content_type": r[3],
+        "content": r[4],
+        "next_run_at": r[5],
+        "repeat_interval": r[6],
+        "created_by": r[7]
+    }
+
+async def add_scheduled_broadcast(from_chat_id: int, message_ids: list, content_type: str, content: str,
+                                  run_at: float, repeat_interval: int, created_by: int) -> int:
+    async with connect_db() as db:
+        cursor = await db.execute("""
+            INSERT INTO scheduled_broadcasts
+                (from_chat_id, message_ids, content_type, content, next_run_at, repeat_interval, created_by)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (from_chat_id, json.dumps(message_ids), content_type, content, run_at, repeat_interval, created_by))
+        await db.commit()
+        return cursor.lastrowid
+
+async def get_scheduled_broadcasts():
+    async with connect_db() as db:
+        async with db.execute("""
+            SELECT id, from_chat_id, message_ids, content_type, content, next_run_at, repeat_interval, created_by
+            FROM scheduled_broadcasts ORDER BY next_run_at
+        """) as cursor:
+            return [scheduled_from_row(r) for r in await cursor.fetchall()]
+
+async def get_scheduled_broadcast(job_id: int):
+    async with connect_db() as db:
+        async with db.execute("""
+            SELECT id, from_chat_id, message_ids, content_type, content, next_run_at, repeat_interval, created_by
+            FROM scheduled_broadcasts WHERE id = ?
+        """, (job_id,)) as cursor:
+            row = await cursor.fetchone()
+    return scheduled_from_row(row) if row else None
+
+async def claim_scheduled_run(job_id: int, run_at: float, next_run_at: float = None) -> bool:
+    # Сравнение с run_at: запуск забирает только один процесс, устаревшие
+    # записи таймеров (после перечитывания или смены лидера) ничего не делают.
+    # next_run_at=None — рассылка однократная и удаляется
+    async with connect_db() as db:
+        if next_run_at is None:
+            cursor = await db.execute(
+                "DELETE FROM scheduled_broadcasts WHERE id = ? AND next_run_at = ?", (job_id, run_at)
+            )
+        else:
+            cursor = await db.execute(
+                "UPDATE scheduled_broadcasts SET next_run_at = ? WHERE id = ? AND next_run_at = ?",
+                (next_run_at, job_id, run_at)
+            )
+        await db.commit()
+        return cursor.rowcount > 0
+
+async def delete_scheduled_broadcast(job_id: int) -> bool:
+    async with connect_db() as db:
+        cursor = await db.execute("DELETE FROM scheduled_broadcasts WHERE id = ?", (job_id,))
+        await db.commit()
+        return cursor.rowcount > 0
@@ -0,0 +1,9 @@
+from aiogram.filters import Filter
+
+from team_bot.db import is_admin
+
+
+class IsAdmin(Filter):
+    # Проверка по кэшу админов; стоит на уровне роутера и отсекает всю группу
+    async def __call__(self, event) -> bool:
+        return await is_admin(event.from_user.id)
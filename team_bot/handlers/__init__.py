@@ -0,0 +1,78 @@
+import importlib
+
+from aiogram import F, Router
+from aiogram.types import CallbackQuery
+
+from team_bot.filters import IsAdmin
+from team_bot.throttling import ThrottlingMiddleware
+
+# Админские модули импортируются при первом апдейте от админа. Порядок важен:
+# в broadcast, bulk и admin есть хендлеры "любое сообщение в состоянии FSM",
+# поэтому модули с командами (/export, /payouts, /backup, /admin) идут раньше
+ADMIN_MODULES = (
+    "team_bot.handlers.maintenance",
+    "team_bot.handlers.admin",
+    "team_bot.handlers.broadcast",
+    "team_bot.handlers.bulk"
+)
+# callback_data кнопок админки: не-админу на них отвечаем "нет прав"
+ADMIN_CALLBACK_PREFIXES = (
+    "admin_", "add_admin", "remove_admin", "list_admins", "broadcast_", "segment_", "schedule",
+    "unschedule_", "delete_", "confirm_delete_all", "bulk_", "review_page_", "rv_", "approve_",
+    "reject_", "ban_", "add_profit_", "remove_profit_", "change_percent_", "stats_chart_"
+)
+
+
+class LazyRouter(Router):
+    # Подроутеры из modules подключаются при первом апдейте, дошедшем до этого
+    # роутера, то есть уже после фильтров родительской группы.
+    # Типы апдейтов для polling берутся до загрузки, поэтому ленивые модули
+    # не должны добавлять новых типов (сейчас только message и callback_query)
+    def __init__(self, *modules: str, name: str = None):
+        super().__init__(name=name)
+        self.modules = modules
+
+    def load(self):
+        modules, self.modules = self.modules, ()
+        for module in modules:
+            self.include_router(importlib.import_module(module).router)
+
+    async def propagate_event(self, update_type: str, event, **kwargs):
+        if self.modules:
+            self.load()
+        return await super().propagate_event(update_type, event, **kwargs)
+
+
+fallback_router = Router(name="fallback")
+
+@fallback_router.callback_query(F.data.startswith(ADMIN_CALLBACK_PREFIXES))
+async def unauthorized_callback(callback: CallbackQuery):
+    # Кнопки админки, нажатые не админом: их группу отсёк IsAdmin
+    await callback.answer("У вас нет прав!")
+
+@fallback_router.callback_query()
+async def stale_callback(callback: CallbackQuery):
+    # Устаревшие кнопки пользователя (submit/restart после сброса состояния):
+    # молча гасим индикатор загрузки
+    await callback.answer()
+
+def setup_routers(dp: Router):
+    from team_bot.handlers import application, user
+
+    # Пользовательские сценарии — только в личке; в группе админов
+    # эти фильтры отсекают их одной проверкой
+    private = Router(name="private")
+    private.message.filter(F.chat.type == "private")
+    private.callback_query.filter(F.message.chat.type == "private")
+    # Антифлуд только для пользовательских сценариев; админские группы не ограничены
+    throttling = ThrottlingMiddleware()
+    private.message.middleware(throttling)
+    private.callback_query.middleware(throttling)
+    private.include_routers(application.router, user.router)
+
+    admin = Router(name="admin_zone")
+    admin.message.filter(IsAdmin())
+    admin.callback_query.filter(IsAdmin())
+    admin.include_router(LazyRouter(*ADMIN_MODULES, name="admin_lazy"))
+
+    dp.include_routers(private, admin, fallback_router)
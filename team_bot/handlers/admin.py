@@ -0,0 +1,470 @@
+import asyncio
+import math
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from aiogram import F, Router
+from aiogram.exceptions import TelegramAPIError
+from aiogram.filters import Command
+from aiogram.fsm.context import FSMContext
+from aiogram.types import BufferedInputFile, CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
+
+from team_bot.charts import render_bar_panels
+from team_bot.config import ADMIN_IDS, CHART_CACHE_TTL, CHART_PERIODS
+from team_bot.db import (
+    add_admin_to_db, add_profit, find_user_by_username, get_all_admins, get_rollups, get_stats, get_user,
+    remove_admin_from_db, remove_profit, update_percent
+)
+from team_bot.helpers import claim_status_change, mark_application
+from team_bot.keyboards import (
+    get_admin_manage_keyboard, get_admin_panel_keyboard, get_admin_user_keyboard
+)
+from team_bot.notifications import PROFIT_NOTICE, outbox
+from team_bot.profiling import perf_stats
+from team_bot.states import AddAdmin, AdminAddProfit, AdminChangePercent, AdminRemoveProfit, AdminSearch, RemoveAdmin
+
+# Все хендлеры модуля стоят за фильтром IsAdmin группы admin (см. handlers/__init__.py)
+router = Router(name="admin")
+
+# ==================== ADMIN HANDLERS ====================
+@router.message(Command("admin"))
+async def admin_panel_cmd(message: Message):
+    try:
+        await message.delete()
+    except TelegramAPIError:
+        pass
+    
+    await message.bot.send_message(
+        message.chat.id,
+        "🎛 АДМИН-ПАНЕЛЬ\n\nВыберите действие:",
+        reply_markup=get_admin_panel_keyboard()
+    )
+
+@router.message(Command("perf"))
+async def perf_cmd(message: Message):
+    arg = (message.text or "").partition(" ")[2].strip().lower()
+    if arg == "on":
+        perf_stats.enabled = True
+        await message.answer("⏱ Профилирование включено")
+        return
+    elif arg == "off":
+        perf_stats.enabled = False
+        await message.answer("⏱ Профилирование выключено")
+        return
+    elif arg == "reset":
+        perf_stats.reset()
+        await message.answer("⏱ Статистика сброшена")
+        return
+    
+    top = perf_stats.top()
+    if not top:
+        state_text = "включено" if perf_stats.enabled else "выключено (/perf on)"
+        await message.answer(f"⏱ Нет данных. Профилирование {state_text}")
+        return
+    
+    lines = ["⏱ ПРОИЗВОДИТЕЛЬНОСТЬ (мс, p50/p95/p99)\n"]
+    for key, hists in top:
+        wall = hists["wall"]
+        lines.append(
+            f"{key} ×{wall.total}\n"
+            f" └ всего: {wall.percentile(50) / 1000:.1f}/{wall.percentile(95) / 1000:.1f}/{wall.percentile(99) / 1000:.1f}\n"
+            f" └ БД p95: {hists['db'].percentile(95) / 1000:.1f} | API p95: {hists['api'].percentile(95) / 1000:.1f}"
+        )
+    await message.answer("\n".join(lines))
+
+@router.callback_query(F.data == "admin_panel")
+async def admin_panel_callback(callback: CallbackQuery, state: FSMContext):
+    await state.clear()
+    await callback.message.edit_text(
+        "🎛 АДМИН-ПАНЕЛЬ\n\nВыберите действие:",
+        reply_markup=get_admin_panel_keyboard()
+    )
+
+@router.callback_query(F.data == "admin_search")
+async def admin_search_start(callback: CallbackQuery, state: FSMContext):
+    await callback.message.edit_text(
+        "🔍 Поиск пользователя\n\nОтправьте username (с @ или без) или user_id:",
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text="🔙 Назад", callback_data="admin_panel")]
+        ])
+    )
+    await state.set_state(AdminSearch.waiting_search)
+
+@router.message(AdminSearch.waiting_search)
+async def admin_search_process(message: Message, state: FSMContext):
+    search_term = message.text.strip()
+    
+    if search_term.isdigit():
+        user = await get_user(int(search_term))
+    else:
+        user = await find_user_by_username(search_term)
+    
+    if not user:
+        await message.answer(
+            "❌ Пользователь не найден",
+            reply_markup=get_admin_panel_keyboard()
+        )
+        await state.clear()
+        return
+    
+    status_emoji = {
+        "pending": "⏳",
+        "approved": "✅",
+        "rejected": "❌",
+        "banned": "🚫"
+    }
+    
+    user_info = f"""👤 ИНФОРМАЦИЯ О ПОЛЬЗОВАТЕЛЕ
+
+🆔 ID: {user['user_id']}
+👤 Username: @{user['username'] or 'не установлен'}
+✏️ Ник: {user['nickname'] or 'не установлен'}
+{status_emoji.get(user['status'], '❓')} Статус: {user['status']}
+📊 Процент: {user['percent']}%
+📈 Профитов: {user['profits_count']}
+💰 Сумма: {user['profits_sum']}$
+💳 Кошелек: {user['wallet'] or 'не привязан'}"""
+    
+    await message.answer(
+        user_info,
+        reply_markup=get_admin_user_keyboard(user['user_id'])
+    )
+    await state.clear()
+
+# ==================== ADMIN MANAGEMENT ====================
+@router.callback_query(F.data == "admin_manage_admins")
+async def admin_manage_menu(callback: CallbackQuery):
+    if callback.from_user.id not in ADMIN_IDS:
+        await callback.answer("⛔️ Только главный админ может управлять админами!")
+        return
+    
+    await callback.message.edit_text(
+        "🛡️ УПРАВЛЕНИЕ АДМИНИСТРАТОРАМИ\n\nВыберите действие:",
+        reply_markup=get_admin_manage_keyboard()
+    )
+
+@router.callback_query(F.data == "add_admin")
+async def add_admin_start(callback: CallbackQuery, state: FSMContext):
+    if callback.from_user.id not in ADMIN_IDS:
+        await callback.answer("⛔️ Только главный админ может добавлять админов!")
+        return
+    
+    await callback.message.edit_text(
+        "➕ ДОБАВИТЬ АДМИНИСТРАТОРА\n\nОтправьте user_id нового администратора:",
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text="🔙 Назад", callback_data="admin_manage_admins")]
+        ])
+    )
+    await state.set_state(AddAdmin.waiting_id)
+
+@router.message(AddAdmin.waiting_id)
+async def add_admin_process(message: Message, state: FSMContext):
+    if message.from_user.id not in ADMIN_IDS:
+        return
+    
+    try:
+        admin_id = int(message.text.strip())
+        
+        if admin_id in ADMIN_IDS:
+            await message.answer("❌ Этот пользователь уже главный админ")
+            await state.clear()
+            return
+        
+        admins = await get_all_admins()
+        if admin_id in admins:
+            await message.answer("❌ Этот пользователь уже является админом")
+            await state.clear()
+            return
+        
+        await add_admin_to_db(admin_id)
+        
+        try:
+            await message.bot.send_message(
+                admin_id,
+                "🛡️ Вы назначены администратором бота!\n\n"
+                "Теперь у вас есть доступ к админ-панели.\n"
+                "Используйте команду /admin для управления."
+            )
+        except TelegramAPIError:
+            pass
+        
+        await message.answer(
+            f"✅ Администратор добавлен!\nID: {admin_id}",
+            reply_markup=get_admin_panel_keyboard()
+        )
+        await state.clear()
+    except ValueError:
+        await message.answer("❌ Неверный формат ID. Отправьте числовой ID пользователя.")
+
+@router.callback_query(F.data == "remove_admin")
+async def remove_admin_start(callback: CallbackQuery, state: FSMContext):
+    if callback.from_user.id not in ADMIN_IDS:
+        await callback.answer("⛔️ Только главный админ может удалять админов!")
+        return
+    
+    await callback.message.edit_text(
+        "➖ УДАЛИТЬ АДМИНИСТРАТОРА\n\nОтправьте user_id администратора для удаления:",
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text="🔙 Назад", callback_data="admin_manage_admins")]
+        ])
+    )
+    await state.set_state(RemoveAdmin.waiting_id)
+
+@router.message(RemoveAdmin.waiting_id)
+async def remove_admin_process(message: Message, state: FSMContext):
+    if message.from_user.id not in ADMIN_IDS:
+        return
+    
+    try:
+        admin_id = int(message.text.strip())
+        
+        if admin_id in ADMIN_IDS:
+            await message.answer("❌ Нельзя удалить главного админа")
+            await state.clear()
+            return
+        
+        admins = await get_all_admins()
+        if admin_id not in admins:
+            await message.answer("❌ Этот пользователь не является админом")
+            await state.clear()
+            return
+        
+        await remove_admin_from_db(admin_id)
+        
+        try:
+            await message.bot.send_message(admin_id, "⚠️ Вы сняты с должности администратора.")
+        except TelegramAPIError:
+            pass
+        
+        await message.answer(
+            f"✅ Администратор удалён!\nID: {admin_id}",
+            reply_markup=get_admin_panel_keyboard()
+        )
+        await state.clear()
+    except ValueError:
+        await message.answer("❌ Неверный формат ID. Отправьте числовой ID пользователя.")
+
+@router.callback_query(F.data == "list_admins")
+async def list_admins(callback: CallbackQuery):
+    if callback.from_user.id not in ADMIN_IDS:
+        await callback.answer("⛔️ Только главный админ может видеть список админов!")
+        return
+    
+    admins = await get_all_admins()
+    
+    admin_text = "👥 СПИСОК АДМИНИСТРАТОРОВ\n\n"
+    admin_text += "🔴 Главные администраторы:\n"
+    for admin_id in ADMIN_IDS:
+        admin_text += f"  └ ID: {admin_id}\n"
+    
+    if admins:
+        admin_text += "\n🟢 Дополнительные администраторы:\n"
+        for admin_id in admins:
+            if admin_id not in ADMIN_IDS:
+                admin_text += f"  └ ID: {admin_id}\n"
+    else:
+        admin_text += "\n🟢 Дополнительных админов нет"
+    
+    await callback.message.edit_text(
+        admin_text,
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text="🔙 Назад", callback_data="admin_manage_admins")]
+        ])
+    )
+
+@router.callback_query(F.data == "admin_stats")
+async def admin_stats(callback: CallbackQuery):
+    stats = await get_stats()
+    
+    stats_text = f"""📊 СТАТИСТИКА
+
+⏳ Ожидают: {stats['pending']}
+✅ Одобрено: {stats['approved']}
+❌ Отклонено: {stats['rejected']}
+🚫 Забанено: {stats['banned']}
+
+💰 Общая сумма профитов: {stats['total_profits']}$"""
+    
+    await callback.message.edit_text(
+        stats_text,
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=[
+            [
+                InlineKeyboardButton(text=f"📈 {days} дн.", callback_data=f"stats_chart_{days}")
+                for days in CHART_PERIODS
+            ],
+            [InlineKeyboardButton(text="🔙 Назад", callback_data="admin_panel")]
+        ])
+    )
+
+# ==================== ANALYTICS ====================
+# Панели дашборда: подпись, серии (метрика, цвет, значок для подписи), максимум шкалы
+DASHBOARD_PANELS = [
+    ("Новые заявки", [("applications", (66, 133, 244), "🟦")], None),
+    ("Одобрено / отклонено / забанено", [
+        ("approved", (52, 168, 83), "🟩"), ("rejected", (251, 188, 5), "🟨"), ("banned", (234, 67, 53), "🟥")
+    ], None),
+    ("Профиты, $", [("profits", (255, 112, 67), "🟧")], None),
+    ("Доставляемость рассылок, %", [("delivery_rate", (142, 68, 173), "🟪")], 100)
+]
+
+# период -> (срок годности, file_id или PNG, подпись): повторный просмотр
+# не читает БД и не рисует заново, а после первой отправки — и не загружает файл
+chart_cache = {}
+
+def build_dashboard(rollups: dict, days: int, today: date):
+    day_keys = [(today - timedelta(days=days - 1 - i)).isoformat() for i in range(days)]
+    sent, failed = rollups.get("broadcast_sent", {}), rollups.get("broadcast_failed", {})
+    rollups["delivery_rate"] = {
+        day: sent.get(day, 0) / (sent.get(day, 0) + failed.get(day, 0)) * 100
+        for day in day_keys if sent.get(day, 0) + failed.get(day, 0)
+    }
+    panels = []
+    lines = [f"📈 АНАЛИТИКА ЗА {days} ДН."]
+    for title, series, _ in DASHBOARD_PANELS:
+        panels.append([([rollups.get(metric, {}).get(day) for day in day_keys], color) for metric, color, _ in series])
+        values = []
+        for metric, _, mark in series:
+            daily = rollups.get(metric, {})
+            if metric == "delivery_rate":
+                total = sum(sent.values()) + sum(failed.values())
+                values.append(f"{mark} {sum(sent.values()) / total * 100:.1f}%" if total else f"{mark} —")
+            else:
+                values.append(f"{mark} {sum(daily.values()):g}")
+        lines.append(f"\n{title}: {' / '.join(values)}")
+    return render_bar_panels(panels, [peak for _, _, peak in DASHBOARD_PANELS]), "\n".join(lines)
+
+@router.callback_query(F.data.startswith("stats_chart_"))
+async def stats_chart(callback: CallbackQuery):
+    days = int(callback.data.split("_")[2])
+    if days not in CHART_PERIODS:
+        await callback.answer()
+        return
+    
+    cached = chart_cache.get(days)
+    if cached is None or cached[0] < time.monotonic():
+        rollups = await get_rollups(days)
+        png, caption = await asyncio.to_thread(build_dashboard, rollups, days, datetime.now(timezone.utc).date())
+        cached = (time.monotonic() + CHART_CACHE_TTL, BufferedInputFile(png, f"stats_{days}d.png"), caption)
+    
+    await callback.answer()
+    sent = await callback.message.answer_photo(cached[1], caption=cached[2])
+    chart_cache[days] = (cached[0], sent.photo[-1].file_id if sent.photo else cached[1], cached[2])
+
+@router.callback_query(F.data.startswith("approve_"))
+async def approve_application(callback: CallbackQuery):
+    if not await claim_status_change(
+        callback, "approve", "approved", ("pending",), "Поздравляю! Ваша заявка принята", "main_menu"
+    ):
+        return
+    
+    await mark_application(callback, "✅ ОДОБРЕНО")
+    await callback.answer("Заявка одобрена")
+
+@router.callback_query(F.data.startswith("reject_"))
+async def reject_application(callback: CallbackQuery):
+    if not await claim_status_change(
+        callback, "reject", "rejected", ("pending",), "К сожалению, ваша заявка отклонена"
+    ):
+        return
+    
+    await mark_application(callback, "❌ ОТКЛОНЕНО")
+    await callback.answer("Заявка отклонена")
+
+@router.callback_query(F.data.startswith("ban_"))
+async def ban_user(callback: CallbackQuery):
+    if not await claim_status_change(
+        callback, "ban", "banned", ("pending", "approved", "rejected"), "Вы были забанены администратором."
+    ):
+        return
+    
+    await callback.answer("✅ Пользователь забанен", show_alert=True)
+    await callback.message.edit_text(callback.message.text + "\n\n🚫 ЗАБАНЕН")
+
+@router.callback_query(F.data.startswith("change_percent_"))
+async def change_percent_start(callback: CallbackQuery, state: FSMContext):
+    user_id = int(callback.data.split("_")[2])
+    await callback.message.answer("📊 Введите новый процент (число от 0 до 100):")
+    await state.set_state(AdminChangePercent.waiting_percent)
+    await state.update_data(target_user_id=user_id)
+
+@router.message(AdminChangePercent.waiting_percent)
+async def process_percent(message: Message, state: FSMContext):
+    try:
+        percent = int(message.text)
+        if percent < 0 or percent > 100:
+            await message.answer("❌ Процент должен быть от 0 до 100")
+            return
+        
+        data = await state.get_data()
+        target_user_id = data["target_user_id"]
+        
+        await update_percent(
+            target_user_id, percent, f"🌪 Поздравляем! Ваш процент поднят\n └ Процент: {percent}%"
+        )
+        outbox.wake()
+        
+        await message.answer(
+            f"✅ Процент изменен на {percent}%",
+            reply_markup=get_admin_panel_keyboard()
+        )
+        await state.clear()
+    except ValueError:
+        await message.answer("❌ Введите корректное число")
+
+@router.callback_query(F.data.startswith("add_profit_"))
+async def add_profit_start(callback: CallbackQuery, state: FSMContext):
+    user_id = int(callback.data.split("_")[2])
+    await callback.message.answer("➕ Введите сумму профита ($):")
+    await state.set_state(AdminAddProfit.waiting_amount)
+    await state.update_data(target_user_id=user_id)
+
+@router.message(AdminAddProfit.waiting_amount)
+async def process_add_profit(message: Message, state: FSMContext):
+    try:
+        amount = float(message.text)
+        if not math.isfinite(amount):
+            raise ValueError(amount)
+        if amount <= 0:
+            await message.answer("❌ Сумма должна быть положительной")
+            return
+        
+        data = await state.get_data()
+        target_user_id = data["target_user_id"]
+        
+        await add_profit(target_user_id, amount, PROFIT_NOTICE.format(amount=amount))
+        outbox.wake()
+        
+        await message.answer(
+            f"✅ Профит ${amount} начислен",
+            reply_markup=get_admin_panel_keyboard()
+        )
+        await state.clear()
+    except ValueError:
+        await message.answer("❌ Введите корректную сумму")
+
+@router.callback_query(F.data.startswith("remove_profit_"))
+async def remove_profit_start(callback: CallbackQuery, state: FSMContext):
+    user_id = int(callback.data.split("_")[2])
+    await callback.message.answer("➖ Введите сумму для удаления ($):")
+    await state.set_state(AdminRemoveProfit.waiting_amount)
+    await state.update_data(target_user_id=user_id)
+
+@router.message(AdminRemoveProfit.waiting_amount)
+async def process_remove_profit(message: Message, state: FSMContext):
+    try:
+        amount = float(message.text)
+        if not math.isfinite(amount):
+            raise ValueError(amount)
+        if amount <= 0:
+            await message.answer("❌ Сумма должна быть положительной")
+            return
+        
+        data = await state.get_data()
+        await remove_profit(data["target_user_id"], amount)
+        await message.answer(
+            f"✅ Профит ${amount} удален",
+            reply_markup=get_admin_panel_keyboard()
+        )
+        await state.clear()
+    except ValueError:
+        await message.answer("❌ Введите корректную сумму")
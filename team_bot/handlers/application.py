@@ -0,0 +1,153 @@
+from aiogram import F, Router
+from aiogram.filters import Command
+from aiogram.fsm.context import FSMContext
+from aiogram.types import CallbackQuery, Message
+
+from team_bot.db import APPLY_CLOSED_STATUSES, get_user, mark_deliverable, save_application
+from team_bot.helpers import delete_messages_later
+from team_bot.keyboards import get_confirm_keyboard, get_main_menu, get_start_keyboard
+from team_bot.notifications import admin_notifier
+from team_bot.states import ApplicationForm
+
+router = Router(name="application")
+
+@router.message(Command("start"), flags={"throttle": "start"})
+async def cmd_start(message: Message, state: FSMContext):
+    await state.clear()
+    user = await get_user(message.from_user.id)
+    
+    if user:
+        if not user["deliverable"]:
+            # пользователь снова пишет боту — значит, доставка опять возможна
+            await mark_deliverable(user["user_id"])
+        if user["status"] == "rejected":
+            await message.answer("К сожалению, ваша заявка была отклонена. Повторная подача невозможна.")
+            return
+        elif user["status"] == "banned":
+            await message.answer("Вы были забанены администратором.")
+            return
+        elif user["status"] == "approved":
+            await message.answer("Добро пожаловать!", reply_markup=get_main_menu())
+            return
+        elif user["status"] == "pending":
+            await message.answer("Ваша заявка уже находится на рассмотрении.")
+            return
+    
+    await message.answer(
+        "Приветствую! Чтобы вступить в команду, необходимо подать заявку",
+        reply_markup=get_start_keyboard()
+    )
+
+@router.callback_query(F.data == "apply", flags={"throttle": "apply"})
+async def start_application(callback: CallbackQuery, state: FSMContext):
+    # Старая кнопка "Подать заявку" остаётся в чате: по ней не должен
+    # проходить тот, по кому решение уже принято
+    user = await get_user(callback.from_user.id)
+    if user and user["status"] in APPLY_CLOSED_STATUSES:
+        await callback.answer("Повторная подача заявки невозможна", show_alert=True)
+        return
+    
+    await callback.message.edit_text("Откуда вы узнали о команде?")
+    await state.set_state(ApplicationForm.source)
+    await state.update_data(messages=[callback.message.message_id])
+
+@router.message(ApplicationForm.source)
+async def process_source(message: Message, state: FSMContext):
+    data = await state.get_data()
+    messages = data.get("messages", [])
+    messages.extend([message.message_id])
+    
+    await state.update_data(source=message.text, messages=messages)
+    msg = await message.answer("Какой у вас опыт в данной сфере?")
+    messages.append(msg.message_id)
+    await state.update_data(messages=messages)
+    await state.set_state(ApplicationForm.experience)
+
+@router.message(ApplicationForm.experience)
+async def process_experience(message: Message, state: FSMContext):
+    data = await state.get_data()
+    messages = data.get("messages", [])
+    messages.append(message.message_id)
+    
+    await state.update_data(experience=message.text, messages=messages)
+    msg = await message.answer("Сколько времени вы готовы уделять работе?")
+    messages.append(msg.message_id)
+    await state.update_data(messages=messages)
+    await state.set_state(ApplicationForm.time)
+
+@router.message(ApplicationForm.time)
+async def process_time(message: Message, state: FSMContext):
+    data = await state.get_data()
+    messages = data.get("messages", [])
+    messages.append(message.message_id)
+    
+    await state.update_data(time=message.text, messages=messages)
+    msg = await message.answer("Почему мы должны взять вас в команду?")
+    messages.append(msg.message_id)
+    await state.update_data(messages=messages)
+    await state.set_state(ApplicationForm.why)
+
+@router.message(ApplicationForm.why)
+async def process_why(message: Message, state: FSMContext):
+    data = await state.get_data()
+    messages = data.get("messages", [])
+    messages.append(message.message_id)
+    
+    await state.update_data(why=message.text, messages=messages)
+    
+    summary = f"""Откуда вы узнали о команде
+ └ {data['source']}
+
+Какой у вас опыт в данной сфере
+ └ {data['experience']}
+
+Сколько времени вы готовы уделять работе
+ └ {data['time']}
+
+Почему мы должны взять вас в команду
+ └ {message.text}"""
+    
+    msg = await message.answer(summary, reply_markup=get_confirm_keyboard())
+    messages.append(msg.message_id)
+    await state.update_data(messages=messages)
+    await state.set_state(ApplicationForm.confirm)
+
+@router.callback_query(F.data == "submit", ApplicationForm.confirm, flags={"throttle": "apply"})
+async def submit_application(callback: CallbackQuery, state: FSMContext):
+    data = await state.get_data()
+    messages = data.get("messages", [])
+    
+    answers = {
+        "source": data["source"],
+        "experience": data["experience"],
+        "availability": data["time"],
+        "motivation": data["why"]
+    }
+    
+    saved = await save_application(
+        callback.from_user.id,
+        callback.from_user.username or "",
+        answers
+    )
+    if not saved:
+        await state.clear()
+        delete_messages_later(callback.message.chat.id, messages)
+        await callback.answer("Повторная подача заявки невозможна", show_alert=True)
+        return
+    
+    # Сначала ответ пользователю; уборка анкеты и уведомление админов — в фоне
+    await callback.message.answer("Ваша заявка отправлена на рассмотрение!")
+    await state.clear()
+    delete_messages_later(callback.message.chat.id, messages)
+    
+    admin_notifier.put(callback.from_user.id, callback.from_user.username, answers)
+
+@router.callback_query(F.data == "restart", ApplicationForm.confirm)
+async def restart_application(callback: CallbackQuery, state: FSMContext):
+    data = await state.get_data()
+    messages = data.get("messages", [])
+    delete_messages_later(callback.message.chat.id, messages)
+    
+    msg = await callback.message.answer("Откуда вы узнали о команде?")
+    await state.set_state(ApplicationForm.source)
+    await state.update_data(messages=[msg.message_id])
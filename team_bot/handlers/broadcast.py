@@ -0,0 +1,557 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from aiogram import F, Router
+from aiogram.exceptions import TelegramAPIError, TelegramBadRequest
+from aiogram.fsm.context import FSMContext
+from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
+
+from team_bot.broadcasting import BroadcastPayload, broadcast_timers, deliver_broadcast, format_broadcast_report
+from team_bot.config import BROADCAST_DELAY, SCHEDULE_REPEATS
+from team_bot.db import (
+    add_scheduled_broadcast, count_segment, delete_all_broadcasts, delete_broadcast_by_id, delete_scheduled_broadcast,
+    find_user_by_username, get_all_broadcasts, get_broadcast, get_recent_broadcasts,
+    get_scheduled_broadcasts, get_user, mark_undeliverable
+)
+from team_bot.keyboards import (
+    get_admin_panel_keyboard, get_broadcast_keyboard, get_delete_broadcast_keyboard, get_schedule_repeat_keyboard
+)
+from team_bot.session import is_permanent_error
+from team_bot.states import BroadcastAll, BroadcastOne, BroadcastSchedule, BroadcastSegment
+
+router = Router(name="broadcast")
+
+# ==================== BROADCAST PAYLOAD ====================
+MEDIA_GROUP_WAIT = 1.0  # сек, ждём остальные части альбома
+
+media_groups = {}
+
+async def collect_media_group(message: Message):
+    # Первое сообщение альбома собирает остальные части и получает весь список,
+    # для остальных частей возвращается None
+    group = media_groups.get(message.media_group_id)
+    if group is not None:
+        group.append(message)
+        return None
+    media_groups[message.media_group_id] = [message]
+    await asyncio.sleep(MEDIA_GROUP_WAIT)
+    return media_groups.pop(message.media_group_id)
+
+async def build_payload(message: Message):
+    if not message.media_group_id:
+        return BroadcastPayload.from_messages([message])
+    messages = await collect_media_group(message)
+    return BroadcastPayload.from_messages(messages) if messages else None
+
+# ==================== BROADCAST ====================
+@router.callback_query(F.data == "admin_broadcast")
+async def admin_broadcast_menu(callback: CallbackQuery):
+    await callback.message.edit_text(
+        "📢 РАССЫЛКИ\n\nВыберите тип рассылки:",
+        reply_markup=get_broadcast_keyboard()
+    )
+
+@router.callback_query(F.data == "broadcast_all")
+async def broadcast_all_start(callback: CallbackQuery, state: FSMContext):
+    await callback.message.edit_text(
+        "📣 РАССЫЛКА ВСЕМ УЧАСТНИКАМ\n\n"
+        "Отправьте сообщение для рассылки.\n"
+        "Можно отправить любое сообщение: текст с форматированием, фото, видео, "
+        "альбом, документ, голосовое, стикер.",
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text="🔙 Назад", callback_data="admin_broadcast")]
+        ])
+    )
+    await state.set_state(BroadcastAll.waiting_message)
+
+@router.message(BroadcastAll.waiting_message)
+async def broadcast_all_process(message: Message, state: FSMContext):
+    payload = await build_payload(message)
+    if payload is None:
+        return
+    
+    status_msg = await message.answer("📤 Отправка...")
+    result = await deliver_broadcast(payload, status_msg)
+    
+    if not result["total"]:
+        await status_msg.edit_text("❌ Нет пользователей для рассылки")
+    else:
+        await status_msg.edit_text(format_broadcast_report(result), reply_markup=get_admin_panel_keyboard())
+    await state.clear()
+
+# ==================== SEGMENT BROADCAST ====================
+SEGMENT_HELP = (
+    "🎯 РАССЫЛКА ПО СЕГМЕНТУ\n\n"
+    "Отправьте фильтры, по одному на строку (любые можно пропустить):\n"
+    "статус: approved, pending, rejected\n"
+    "процент: 60-80\n"
+    "профит: 100-   (от 100$)\n"
+    "кошелёк: есть | нет\n"
+    "дата: 01.01.2026-31.03.2026   (дата вступления)\n\n"
+    "Без статуса берутся одобренные участники."
+)
+SEGMENT_STATUSES = ("approved", "pending", "rejected")
+
+def parse_range(value: str, convert):
+    low, sep, high = value.partition("-")
+    low, high = low.strip(), high.strip()
+    if not sep:
+        high = low
+    try:
+        return [convert(low) if low else None, convert(high) if high else None]
+    except ValueError:
+        raise ValueError(f"некорректный диапазон: {value}") from None
+
+def parse_date(value: str) -> str:
+    return datetime.strptime(value, "%d.%m.%Y").strftime("%Y-%m-%d")
+
+def parse_segment(text: str) -> dict:
+    segment = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        key, sep, value = line.partition(":")
+        key, value = key.strip().lower(), value.strip().lower()
+        if not sep or not value:
+            raise ValueError(f"строка без значения: {line.strip()}")
+        if key == "статус":
+            statuses = [s.strip() for s in value.split(",") if s.strip()]
+            unknown = [s for s in statuses if s not in SEGMENT_STATUSES]
+            if unknown:
+                raise ValueError(f"неизвестный статус: {', '.join(unknown)}")
+            segment["statuses"] = statuses
+        elif key == "процент":
+            segment["percent"] = parse_range(value, int)
+        elif key == "профит":
+            segment["profits"] = parse_range(value, float)
+        elif key in ("кошелёк", "кошелек"):
+            if value not in ("есть", "нет"):
+                raise ValueError("кошелёк: есть или нет")
+            segment["wallet"] = value == "есть"
+        elif key == "дата":
+            low, high = parse_range(value, parse_date)
+            # Верхняя граница — включительно, в запросе сравнение с началом следующего дня
+            if high is not None:
+                high = (datetime.strptime(high, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+            segment["joined"] = [low, high]
+        else:
+            raise ValueError(f"неизвестный фильтр: {key}")
+    return segment
+
+def format_segment(segment: dict) -> str:
+    def bounds(values, fmt=str):
+        low, high = values
+        return f"{fmt(low) if low is not None else '…'} — {fmt(high) if high is not None else '…'}"
+
+    lines = [f"Статус: {', '.join(segment.get('statuses') or ['approved'])}"]
+    if "percent" in segment:
+        lines.append(f"Процент: {bounds(segment['percent'])}")
+    if "profits" in segment:
+        lines.append(f"Профит: {bounds(segment['profits'])}$")
+    if "wallet" in segment:
+        lines.append(f"Кошелёк: {'есть' if segment['wallet'] else 'нет'}")
+    if "joined" in segment:
+        low, high = segment["joined"]
+        if high is not None:
+            high = (datetime.strptime(high, "%Y-%m-%d") - timedelta(days=1)).strftime("%Y-%m-%d")
+        lines.append(f"Вступили: {bounds([low, high])}")
+    return "\n".join(lines)
+
+@router.callback_query(F.data == "broadcast_segment")
+async def broadcast_segment_start(callback: CallbackQuery, state: FSMContext):
+    await callback.message.edit_text(
+        SEGMENT_HELP,
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text="🔙 Назад", callback_data="admin_broadcast")]
+        ])
+    )
+    await state.set_state(BroadcastSegment.waiting_filter)
+
+@router.message(BroadcastSegment.waiting_filter)
+async def broadcast_segment_filter(message: Message, state: FSMContext):
+    try:
+        segment = parse_segment(message.text or "")
+    except ValueError as e:
+        await message.answer(f"❌ Не удалось разобрать фильтр: {e}")
+        return
+    
+    # Предпросмотр — один COUNT по индексу, до отправки чего-либо
+    total = await count_segment(segment)
+    await state.update_data(segment=segment)
+    keyboard = [[InlineKeyboardButton(text="✏️ Изменить фильтр", callback_data="broadcast_segment")],
+                [InlineKeyboardButton(text="🔙 Назад", callback_data="admin_broadcast")]]
+    if total:
+        keyboard.insert(0, [InlineKeyboardButton(text="✅ Продолжить", callback_data="segment_confirm")])
+    await message.answer(
+        f"🎯 СЕГМЕНТ\n\n{format_segment(segment)}\n\n👥 Получателей: {total}",
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard)
+    )
+
+@router.callback_query(F.data == "segment_confirm", BroadcastSegment.waiting_filter)
+async def broadcast_segment_confirm(callback: CallbackQuery, state: FSMContext):
+    await callback.message.edit_text(
+        "Отправьте сообщение для рассылки по сегменту.\n"
+        "Можно отправить любое сообщение, включая альбомы."
+    )
+    await state.set_state(BroadcastSegment.waiting_message)
+
+@router.message(BroadcastSegment.waiting_message)
+async def broadcast_segment_process(message: Message, state: FSMContext):
+    payload = await build_payload(message)
+    if payload is None:
+        return
+    
+    data = await state.get_data()
+    status_msg = await message.answer("📤 Отправка...")
+    result = await deliver_broadcast(payload, status_msg, data["segment"])
+    
+    if not result["total"]:
+        await status_msg.edit_text("❌ Нет пользователей в сегменте")
+    else:
+        await status_msg.edit_text(format_broadcast_report(result), reply_markup=get_admin_panel_keyboard())
+    await state.clear()
+
+@router.callback_query(F.data == "broadcast_one")
+async def broadcast_one_start(callback: CallbackQuery, state: FSMContext):
+    await callback.message.edit_text(
+        "👤 РАССЫЛКА ОДНОМУ ПОЛЬЗОВАТЕЛЮ\n\n"
+        "Отправьте username (с @ или без) или user_id пользователя:",
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text="🔙 Назад", callback_data="admin_broadcast")]
+        ])
+    )
+    await state.set_state(BroadcastOne.waiting_user)
+
+@router.message(BroadcastOne.waiting_user)
+async def broadcast_one_user(message: Message, state: FSMContext):
+    search_term = message.text.strip()
+    
+    if search_term.isdigit():
+        user = await get_user(int(search_term))
+    else:
+        user = await find_user_by_username(search_term)
+    
+    if not user:
+        await message.answer(
+            "❌ Пользователь не найден",
+            reply_markup=get_admin_panel_keyboard()
+        )
+        await state.clear()
+        return
+    
+    await state.update_data(target_user_id=user['user_id'])
+    await message.answer(
+        f"✅ Найден: @{user['username']} (ID: {user['user_id']})\n\n"
+        f"Теперь отправьте сообщение для этого пользователя.\n"
+        f"Можно отправить любое сообщение, включая альбомы.",
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text="🔙 Отмена", callback_data="admin_broadcast")]
+        ])
+    )
+    await state.set_state(BroadcastOne.waiting_message)
+
+@router.message(BroadcastOne.waiting_message)
+async def broadcast_one_send(message: Message, state: FSMContext):
+    data = await state.get_data()
+    target_user_id = data.get('target_user_id')
+    
+    payload = await build_payload(message)
+    if payload is None:
+        return
+    
+    try:
+        await payload.send(target_user_id)
+        
+        await message.answer(
+            "✅ Сообщение успешно отправлено!",
+            reply_markup=get_admin_panel_keyboard()
+        )
+    except Exception as e:
+        if is_permanent_error(e):
+            await mark_undeliverable([target_user_id])
+        await message.answer(
+            f"❌ Ошибка отправки: {str(e)}",
+            reply_markup=get_admin_panel_keyboard()
+        )
+    
+    await state.clear()
+
+# ==================== SCHEDULED BROADCASTS ====================
+def parse_schedule_time(text: str, now: datetime):
+    # "ЧЧ:ММ" — сегодня (или завтра, если время прошло), "ДД.ММ ЧЧ:ММ", "ДД.ММ.ГГГГ ЧЧ:ММ"
+    text = " ".join(text.split())
+    for fmt in ("%d.%m.%Y %H:%M", "%d.%m %H:%M", "%H:%M"):
+        try:
+            parsed = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        if fmt == "%H:%M":
+            run_at = now.replace(hour=parsed.hour, minute=parsed.minute, second=0, microsecond=0)
+            return run_at if run_at > now else run_at + timedelta(days=1)
+        if fmt == "%d.%m %H:%M":
+            return parsed.replace(year=now.year)
+        return parsed
+    return None
+
+def format_schedule(job: dict) -> str:
+    run_at = datetime.fromtimestamp(job["next_run_at"]).strftime("%d.%m.%Y %H:%M")
+    repeat = next(
+        (label for label, interval in SCHEDULE_REPEATS.values() if interval == job["repeat_interval"]),
+        f"каждые {job['repeat_interval']} сек"
+    )
+    return f"{run_at} | {repeat}"
+
+@router.callback_query(F.data == "broadcast_schedule")
+async def broadcast_schedule_start(callback: CallbackQuery, state: FSMContext):
+    await callback.message.edit_text(
+        "⏰ ОТЛОЖЕННАЯ РАССЫЛКА\n\n"
+        "Отправьте время первой отправки (время сервера):\n"
+        "ЧЧ:ММ, ДД.ММ ЧЧ:ММ или ДД.ММ.ГГГГ ЧЧ:ММ",
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text="🔙 Назад", callback_data="admin_broadcast")]
+        ])
+    )
+    await state.set_state(BroadcastSchedule.waiting_time)
+
+@router.message(BroadcastSchedule.waiting_time)
+async def broadcast_schedule_time(message: Message, state: FSMContext):
+    now = datetime.now()
+    run_at = parse_schedule_time(message.text or "", now)
+    if run_at is None or run_at <= now:
+        await message.answer("❌ Некорректное время. Пример: 18:30 или 25.12.2026 18:30")
+        return
+    
+    await state.update_data(schedule_run_at=run_at.timestamp())
+    await message.answer(
+        f"🕒 Первая отправка: {run_at.strftime('%d.%m.%Y %H:%M')}\n\nПовторять рассылку?",
+        reply_markup=get_schedule_repeat_keyboard()
+    )
+    await state.set_state(BroadcastSchedule.waiting_repeat)
+
+@router.callback_query(F.data.startswith("schedule_repeat_"), BroadcastSchedule.waiting_repeat)
+async def broadcast_schedule_repeat(callback: CallbackQuery, state: FSMContext):
+    repeat = callback.data.split("_")[2]
+    if repeat not in SCHEDULE_REPEATS:
+        await callback.answer()
+        return
+    await state.update_data(schedule_repeat=repeat)
+    await callback.message.edit_text(
+        f"🔁 {SCHEDULE_REPEATS[repeat][0]}\n\n"
+        "Отправьте сообщение для рассылки (любой тип, включая альбомы).\n"
+        "Не удаляйте его из этого чата до последней отправки: рассылка копирует оригинал."
+    )
+    await state.set_state(BroadcastSchedule.waiting_message)
+
+@router.message(BroadcastSchedule.waiting_message)
+async def broadcast_schedule_save(message: Message, state: FSMContext):
+    payload = await build_payload(message)
+    if payload is None:
+        return
+    
+    data = await state.get_data()
+    run_at = data["schedule_run_at"]
+    interval = SCHEDULE_REPEATS[data["schedule_repeat"]][1]
+    job_id = await add_scheduled_broadcast(
+        payload.from_chat_id, payload.message_ids, payload.content_type, payload.content[:200],
+        run_at, interval, message.from_user.id
+    )
+    broadcast_timers.add(job_id, run_at)
+    
+    await message.answer(
+        f"✅ Рассылка #{job_id} запланирована\n\n"
+        f"{format_schedule({'next_run_at': run_at, 'repeat_interval': interval})}",
+        reply_markup=get_admin_panel_keyboard()
+    )
+    await state.clear()
+
+async def render_scheduled_list(message: Message) -> bool:
+    # Только отрисовка: callback отвечают вызывающие. False — рассылок нет
+    jobs = await get_scheduled_broadcasts()
+    if not jobs:
+        return False
+    
+    keyboard = []
+    for job in jobs[:20]:
+        preview = job['content'][:20] + "..." if len(job['content']) > 20 else job['content']
+        keyboard.append([
+            InlineKeyboardButton(
+                text=f"❌ #{job['id']} {format_schedule(job)} | {preview}",
+                callback_data=f"unschedule_{job['id']}"
+            )
+        ])
+    keyboard.append([InlineKeyboardButton(text="🔙 Назад", callback_data="admin_broadcast")])
+    
+    try:
+        await message.edit_text(
+            f"⏰ ЗАПЛАНИРОВАННЫЕ РАССЫЛКИ: {len(jobs)}\n\n"
+            "Нажмите на рассылку, чтобы отменить её:",
+            reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard)
+        )
+    except TelegramBadRequest:
+        pass  # список не изменился
+    return True
+
+@router.callback_query(F.data == "scheduled_list")
+async def scheduled_list(callback: CallbackQuery):
+    if not await render_scheduled_list(callback.message):
+        await callback.answer("📭 Нет запланированных рассылок", show_alert=True)
+        return
+    await callback.answer()
+
+@router.callback_query(F.data.startswith("unschedule_"))
+async def unschedule_broadcast(callback: CallbackQuery):
+    job_id = int(callback.data.split("_")[1])
+    # Запись в куче таймеров останется, но без строки в БД срабатывание ничего не сделает
+    if await delete_scheduled_broadcast(job_id):
+        text = f"✅ Рассылка #{job_id} отменена"
+    else:
+        text = "Рассылка уже отправлена или отменена"
+    if not await render_scheduled_list(callback.message):
+        try:
+            await callback.message.edit_text(
+                "📭 Нет запланированных рассылок",
+                reply_markup=InlineKeyboardMarkup(inline_keyboard=[
+                    [InlineKeyboardButton(text="🔙 Назад", callback_data="admin_broadcast")]
+                ])
+            )
+        except TelegramBadRequest:
+            pass  # повторное нажатие по уже пустому списку
+    await callback.answer(text)
+
+# ==================== DELETE BROADCASTS ====================
+@router.callback_query(F.data == "delete_broadcast_menu")
+async def delete_broadcast_menu(callback: CallbackQuery):
+    await callback.message.edit_text(
+        "🗑 УДАЛЕНИЕ РАССЫЛОК\n\nВыберите действие:",
+        reply_markup=get_delete_broadcast_keyboard()
+    )
+
+@router.callback_query(F.data == "delete_one_broadcast")
+async def delete_one_broadcast_list(callback: CallbackQuery):
+    broadcasts = await get_recent_broadcasts(10)
+    
+    if not broadcasts:
+        await callback.answer("📭 Нет сохранённых рассылок", show_alert=True)
+        return
+    
+    keyboard = []
+    for broadcast in broadcasts:
+        preview = broadcast['content'][:30] + "..." if len(broadcast['content']) > 30 else broadcast['content']
+        date = broadcast['created_at'][:16]
+        
+        keyboard.append([
+            InlineKeyboardButton(
+                text=f"📅 {date} | {broadcast['content_type']} | {preview}",
+                callback_data=f"delete_br_{broadcast['id']}"
+            )
+        ])
+    
+    keyboard.append([InlineKeyboardButton(text="🔙 Назад", callback_data="delete_broadcast_menu")])
+    
+    await callback.message.edit_text(
+        "📋 ВЫБЕРИТЕ РАССЫЛКУ ДЛЯ УДАЛЕНИЯ\n\n"
+        "Нажмите на рассылку, чтобы удалить её сообщения у всех пользователей:",
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard)
+    )
+
+@router.callback_query(F.data.startswith("delete_br_"))
+async def delete_broadcast_confirm(callback: CallbackQuery):
+    broadcast_id = int(callback.data.split("_")[2])
+    broadcast = await get_broadcast(broadcast_id)
+    
+    if not broadcast:
+        await callback.answer("❌ Рассылка не найдена", show_alert=True)
+        return
+    
+    deleted = 0
+    failed = 0
+    
+    status_msg = await callback.message.edit_text(
+        f"🗑 Удаление рассылки...\n\nОбработано: 0/{len(broadcast['message_ids'])}"
+    )
+    
+    for i, msg_data in enumerate(broadcast['message_ids'], 1):
+        try:
+            user_id, msg_id = map(int, msg_data.split(':'))
+            await callback.bot.delete_message(user_id, msg_id)
+            deleted += 1
+        except (TelegramAPIError, ValueError):
+            failed += 1
+        
+        if i % 10 == 0:
+            await status_msg.edit_text(
+                f"🗑 Удаление рассылки...\n\nОбработано: {i}/{len(broadcast['message_ids'])}"
+            )
+        
+        await asyncio.sleep(BROADCAST_DELAY)
+    
+    await delete_broadcast_by_id(broadcast_id)
+    
+    await status_msg.edit_text(
+        f"✅ Рассылка удалена!\n\n"
+        f"✅ Удалено: {deleted}\n"
+        f"❌ Ошибок: {failed}",
+        reply_markup=get_admin_panel_keyboard()
+    )
+
+@router.callback_query(F.data == "delete_all_broadcasts_confirm")
+async def delete_all_broadcasts_confirm(callback: CallbackQuery):
+    broadcasts = await get_all_broadcasts()
+    
+    if not broadcasts:
+        await callback.answer("📭 Нет рассылок для удаления", show_alert=True)
+        return
+    
+    keyboard = InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="✅ Да, удалить все", callback_data="confirm_delete_all")],
+        [InlineKeyboardButton(text="❌ Отмена", callback_data="delete_broadcast_menu")]
+    ])
+    
+    await callback.message.edit_text(
+        f"⚠️ ПОДТВЕРЖДЕНИЕ\n\n"
+        f"Вы уверены, что хотите удалить ВСЕ рассылки?\n\n"
+        f"📊 Будет удалено рассылок: {len(broadcasts)}\n"
+        f"📬 Сообщений: {sum(len(b['message_ids']) for b in broadcasts)}\n\n"
+        f"⚠️ Это действие нельзя отменить!",
+        reply_markup=keyboard
+    )
+
+@router.callback_query(F.data == "confirm_delete_all")
+async def delete_all_broadcasts_process(callback: CallbackQuery):
+    broadcasts = await get_all_broadcasts()
+    
+    total_messages = sum(len(b['message_ids']) for b in broadcasts)
+    deleted = 0
+    failed = 0
+    
+    status_msg = await callback.message.edit_text(
+        f"🗑 Удаление всех рассылок...\n\nОбработано: 0/{total_messages}"
+    )
+    
+    processed = 0
+    for broadcast in broadcasts:
+        for msg_data in broadcast['message_ids']:
+            try:
+                user_id, msg_id = map(int, msg_data.split(':'))
+                await callback.bot.delete_message(user_id, msg_id)
+                deleted += 1
+            except (TelegramAPIError, ValueError):
+                failed += 1
+            
+            processed += 1
+            if processed % 20 == 0:
+                await status_msg.edit_text(
+                    f"🗑 Удаление всех рассылок...\n\nОбработано: {processed}/{total_messages}"
+                )
+            
+            await asyncio.sleep(BROADCAST_DELAY)
+    
+    await delete_all_broadcasts()
+    
+    await status_msg.edit_text(
+        f"✅ Все рассылки удалены!\n\n"
+        f"📊 Удалено рассылок: {len(broadcasts)}\n"
+        f"✅ Удалено сообщений: {deleted}\n"
+        f"❌ Ошибок: {failed}",
+        reply_markup=get_admin_panel_keyboard()
+    )
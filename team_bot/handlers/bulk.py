@@ -0,0 +1,234 @@
+import csv
+import io
+import json
+import math
+
+from aiogram import F, Router
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.fsm.context import FSMContext
+from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
+
+from team_bot.config import BULK_IMPORT_MAX_SIZE, BULK_PAGE_SIZE, REVIEW_PAGE_SIZE
+from team_bot.db import bulk_add_profits, bulk_change_status, get_pending_page
+from team_bot.helpers import claim_status_change
+from team_bot.keyboards import get_admin_panel_keyboard
+from team_bot.notifications import PROFIT_NOTICE, format_application_entry, outbox
+from team_bot.states import BulkProfitImport
+
+router = Router(name="bulk")
+
+# действие: (новый статус, допустимые текущие, уведомление пользователю, подпись)
+BULK_ACTIONS = {
+    "approve": ("approved", ("pending",), "Поздравляю! Ваша заявка принята", "✅ Одобрено"),
+    "reject": ("rejected", ("pending",), "К сожалению, ваша заявка отклонена", "❌ Отклонено"),
+    "ban": ("banned", ("pending",), "Вы были забанены администратором.", "🚫 Забанено")
+}
+
+async def render_bulk_page(callback: CallbackQuery, state: FSMContext, page: int):
+    total, users = await get_pending_page(page)
+    pages = max(1, (total + BULK_PAGE_SIZE - 1) // BULK_PAGE_SIZE)
+    if page >= pages:
+        page = pages - 1
+        total, users = await get_pending_page(page)
+    
+    data = await state.get_data()
+    selected = set(data.get("bulk_selected", []))
+    
+    keyboard = []
+    for user in users:
+        mark = "☑️" if user["user_id"] in selected else "⬜️"
+        keyboard.append([InlineKeyboardButton(
+            text=f"{mark} @{user['username'] or 'no_username'} ({user['user_id']})",
+            callback_data=f"bulk_t_{user['user_id']}_{page}"
+        )])
+    
+    nav = []
+    if page > 0:
+        nav.append(InlineKeyboardButton(text="◀️", callback_data=f"bulk_page_{page - 1}"))
+    nav.append(InlineKeyboardButton(text="Выбрать страницу", callback_data=f"bulk_all_{page}"))
+    if page < pages - 1:
+        nav.append(InlineKeyboardButton(text="▶️", callback_data=f"bulk_page_{page + 1}"))
+    keyboard.append(nav)
+    if selected:
+        keyboard.append([
+            InlineKeyboardButton(text="✅ Одобрить", callback_data=f"bulk_do_approve_{page}"),
+            InlineKeyboardButton(text="❌ Отклонить", callback_data=f"bulk_do_reject_{page}"),
+            InlineKeyboardButton(text="🚫 Бан", callback_data=f"bulk_do_ban_{page}")
+        ])
+    keyboard.append([InlineKeyboardButton(text="🔙 Назад", callback_data="admin_panel")])
+    
+    await callback.message.edit_text(
+        f"📋 ЗАЯВКИ НА РАССМОТРЕНИИ\n\n"
+        f"Всего: {total} | Выбрано: {len(selected)}\n"
+        f"Страница {page + 1}/{pages}",
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard)
+    )
+
+@router.callback_query(F.data.startswith("bulk_page_"))
+async def bulk_page(callback: CallbackQuery, state: FSMContext):
+    await render_bulk_page(callback, state, int(callback.data.split("_")[2]))
+    await callback.answer()
+
+@router.callback_query(F.data.startswith("bulk_t_"))
+async def bulk_toggle(callback: CallbackQuery, state: FSMContext):
+    _, _, user_id, page = callback.data.split("_")
+    data = await state.get_data()
+    selected = set(data.get("bulk_selected", []))
+    selected ^= {int(user_id)}
+    await state.update_data(bulk_selected=list(selected))
+    await render_bulk_page(callback, state, int(page))
+    await callback.answer()
+
+@router.callback_query(F.data.startswith("bulk_all_"))
+async def bulk_select_page(callback: CallbackQuery, state: FSMContext):
+    page = int(callback.data.split("_")[2])
+    _, users = await get_pending_page(page)
+    data = await state.get_data()
+    selected = set(data.get("bulk_selected", []))
+    selected.update(user["user_id"] for user in users)
+    await state.update_data(bulk_selected=list(selected))
+    await render_bulk_page(callback, state, page)
+    await callback.answer()
+
+@router.callback_query(F.data.startswith("bulk_do_"))
+async def bulk_apply(callback: CallbackQuery, state: FSMContext):
+    _, _, action, page = callback.data.split("_")
+    status, expected, notice, label = BULK_ACTIONS[action]
+    data = await state.get_data()
+    selected = data.get("bulk_selected", [])
+    if not selected:
+        await callback.answer("Ничего не выбрано")
+        return
+    
+    markup = "main_menu" if status == "approved" else None
+    changed = await bulk_change_status(selected, status, expected, notice, markup)
+    outbox.wake()
+    
+    await state.update_data(bulk_selected=[])
+    await callback.answer(
+        f"{label}: {len(changed)}\nПропущено (уже обработаны): {len(selected) - len(changed)}",
+        show_alert=True
+    )
+    await render_bulk_page(callback, state, int(page))
+
+# Очередь рассмотрения: по REVIEW_PAGE_SIZE анкет на странице с ответами и
+# кнопками решения. После решения страница перечитывается — обработанная
+# заявка уходит, следующая подтягивается
+async def render_review_page(callback: CallbackQuery, page: int):
+    total, applications = await get_pending_page(page, REVIEW_PAGE_SIZE)
+    pages = max(1, (total + REVIEW_PAGE_SIZE - 1) // REVIEW_PAGE_SIZE)
+    if page >= pages:
+        page = pages - 1
+        total, applications = await get_pending_page(page, REVIEW_PAGE_SIZE)
+    
+    first = page * REVIEW_PAGE_SIZE + 1
+    entries = [format_application_entry(i, a) for i, a in enumerate(applications, first)]
+    keyboard = [
+        [
+            InlineKeyboardButton(
+                text=f"✅ {i}. @{a['username'] or a['user_id']}",
+                callback_data=f"rv_{a['user_id']}_approve_{page}"
+            ),
+            InlineKeyboardButton(text=f"❌ {i}", callback_data=f"rv_{a['user_id']}_reject_{page}")
+        ]
+        for i, a in enumerate(applications, first)
+    ]
+    nav = []
+    if page > 0:
+        nav.append(InlineKeyboardButton(text="◀️", callback_data=f"review_page_{page - 1}"))
+    nav.append(InlineKeyboardButton(text="🔄", callback_data=f"review_page_{page}"))
+    if page < pages - 1:
+        nav.append(InlineKeyboardButton(text="▶️", callback_data=f"review_page_{page + 1}"))
+    keyboard.append(nav)
+    keyboard.append([InlineKeyboardButton(text="🔙 Назад", callback_data="admin_panel")])
+    
+    header = f"🗂 ОЧЕРЕДЬ ЗАЯВОК\n\nВсего: {total} | Страница {page + 1}/{pages}"
+    try:
+        await callback.message.edit_text(
+            "\n\n".join([header, *entries]) if entries else f"{header}\n\n📭 Очередь пуста",
+            reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard)
+        )
+    except TelegramBadRequest:
+        pass  # страница не изменилась (обновление или повторное нажатие)
+
+@router.callback_query(F.data.startswith("review_page_"))
+async def review_page(callback: CallbackQuery):
+    await render_review_page(callback, int(callback.data.split("_")[2]))
+    await callback.answer()
+
+@router.callback_query(F.data.startswith("rv_"))
+async def review_decide(callback: CallbackQuery):
+    _, _, action, page = callback.data.split("_")
+    status, expected, notice, label = BULK_ACTIONS[action]
+    markup = "main_menu" if status == "approved" else None
+    if await claim_status_change(callback, action, status, expected, notice, markup):
+        await callback.answer(label)
+    await render_review_page(callback, int(page))
+
+def parse_profit_entries(raw: bytes, filename: str):
+    # CSV: строки "user_id,amount" (заголовок необязателен);
+    # JSON: [{"user_id": 1, "amount": 10.5}, ...] или [[1, 10.5], ...]
+    text = raw.decode("utf-8-sig")
+    if filename.lower().endswith(".json"):
+        items = json.loads(text)
+        rows = [(item["user_id"], item["amount"]) if isinstance(item, dict) else item for item in items]
+    else:
+        rows = [row for row in csv.reader(io.StringIO(text)) if row]
+        if rows and not rows[0][0].strip().isdigit():
+            rows = rows[1:]  # заголовок
+    
+    entries = []
+    skipped = 0
+    for row in rows:
+        try:
+            user_id, amount = int(row[0]), float(row[1])
+        except (ValueError, TypeError, IndexError):
+            skipped += 1
+            continue
+        # nan/inf (в том числе NaN и Infinity из JSON) не проходят сравнение amount <= 0
+        if not math.isfinite(amount) or amount <= 0:
+            skipped += 1
+            continue
+        entries.append((user_id, amount))
+    return entries, skipped
+
+@router.callback_query(F.data == "bulk_import")
+async def bulk_import_start(callback: CallbackQuery, state: FSMContext):
+    await callback.message.edit_text(
+        "📥 ИМПОРТ ПРОФИТОВ\n\n"
+        "Отправьте файл .csv (строки user_id,amount) "
+        "или .json ([{\"user_id\": 1, \"amount\": 10.5}, ...]).\n"
+        "Все начисления применяются одной транзакцией.",
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text="🔙 Назад", callback_data="admin_panel")]
+        ])
+    )
+    await state.set_state(BulkProfitImport.waiting_file)
+
+@router.message(BulkProfitImport.waiting_file)
+async def bulk_import_process(message: Message, state: FSMContext):
+    if not message.document:
+        await message.answer("❌ Отправьте файл .csv или .json")
+        return
+    if message.document.file_size and message.document.file_size > BULK_IMPORT_MAX_SIZE:
+        await message.answer("❌ Файл слишком большой")
+        return
+    
+    raw = await message.bot.download(message.document)
+    try:
+        entries, skipped = parse_profit_entries(raw.read(), message.document.file_name or "")
+    except (ValueError, KeyError, TypeError, UnicodeDecodeError) as e:
+        await message.answer(f"❌ Не удалось разобрать файл: {e}")
+        return
+    
+    applied = await bulk_add_profits(entries, PROFIT_NOTICE)
+    outbox.wake()
+    
+    await message.answer(
+        f"✅ Импорт завершён\n\n"
+        f"Начислено: {len(applied)} на сумму {sum(amount for _, amount in applied):.2f}$\n"
+        f"Неизвестные пользователи: {len(entries) - len(applied)}\n"
+        f"Некорректные строки: {skipped}",
+        reply_markup=get_admin_panel_keyboard()
+    )
+    await state.clear()
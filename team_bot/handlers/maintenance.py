@@ -0,0 +1,137 @@
+import asyncio
+import csv
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+from aiogram import Router
+from aiogram.filters import Command
+from aiogram.types import BufferedInputFile, FSInputFile, Message
+
+from team_bot.backup import backup_database, scheduled_backup
+from team_bot.config import BACKUP_KEEP, EXPORT_CHUNK_SIZE
+from team_bot.db import connect_db, get_payout_rows
+from team_bot.payouts import build_payout_csv, compute_payouts
+from team_bot.scheduler import record_run
+
+router = Router(name="maintenance")
+
+# ==================== EXPORT ====================
+EXPORT_QUERIES = {
+    "users": "SELECT * FROM users ORDER BY user_id",
+    "broadcasts": "SELECT * FROM broadcasts ORDER BY id"
+}
+EXPORT_FORMATS = ("csv", "jsonl")
+
+def make_export_writer(out, fmt: str, columns: list):
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(columns)
+        return writer.writerows
+    
+    def write_jsonl(rows):
+        out.write("".join(
+            json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n" for row in rows
+        ))
+    return write_jsonl
+
+async def export_table(table: str, fmt: str):
+    # Строки читаются пачками и сжимаются в gzip в отдельном потоке:
+    # память не зависит от размера таблицы, event loop не блокируется
+    import gzip
+    import tempfile
+    
+    fd, path = tempfile.mkstemp(prefix=f"{table}_", suffix=f".{fmt}.gz")
+    os.close(fd)
+    out = gzip.open(path, "wt", encoding="utf-8", newline="")
+    rows = 0
+    try:
+        async with connect_db() as db:
+            async with db.execute(EXPORT_QUERIES[table]) as cursor:
+                columns = [column[0] for column in cursor.description]
+                write = make_export_writer(out, fmt, columns)
+                while True:
+                    chunk = await cursor.fetchmany(EXPORT_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    await asyncio.to_thread(write, chunk)
+                    rows += len(chunk)
+    except Exception:
+        out.close()
+        os.remove(path)
+        raise
+    await asyncio.to_thread(out.close)
+    return path, rows
+
+@router.message(Command("export"))
+async def export_cmd(message: Message):
+    args = (message.text or "").split()[1:]
+    table = args[0] if args else "users"
+    fmt = args[1] if len(args) > 1 else "csv"
+    if table not in EXPORT_QUERIES or fmt not in EXPORT_FORMATS:
+        await message.answer(
+            "📦 Выгрузка данных\n\n"
+            f"/export [{'|'.join(EXPORT_QUERIES)}] [{'|'.join(EXPORT_FORMATS)}]\n"
+            "По умолчанию: /export users csv"
+        )
+        return
+    
+    status_msg = await message.answer("⏳ Готовлю выгрузку...")
+    started = time.perf_counter()
+    path, rows = await export_table(table, fmt)
+    try:
+        await message.answer_document(
+            FSInputFile(path, filename=f"{table}_{datetime.now():%Y%m%d_%H%M}.{fmt}.gz"),
+            caption=f"📦 {table}: {rows} строк за {time.perf_counter() - started:.1f} с"
+        )
+    finally:
+        os.remove(path)
+    await status_msg.delete()
+
+# ==================== PAYOUTS ====================
+@router.message(Command("payouts"))
+async def payouts_cmd(message: Message):
+    status_msg = await message.answer("⏳ Считаю выплаты...")
+    started = time.perf_counter()
+    rows = await get_payout_rows()
+    report = await asyncio.to_thread(compute_payouts, rows)
+    if not report["count"]:
+        await status_msg.edit_text("📭 Нет участников с профитами")
+        return
+    
+    data = await asyncio.to_thread(build_payout_csv, rows, report)
+    await message.answer_document(
+        BufferedInputFile(data, filename=f"payouts_{datetime.now():%Y%m%d_%H%M}.csv.gz"),
+        caption=(
+            f"💸 ВЫПЛАТЫ\n\n"
+            f"👥 Участников с профитами: {report['count']}\n"
+            f"💰 Профиты: {report['profits']:.2f}$\n"
+            f"💸 К выплате: {report['total']:.2f}$\n"
+            f"🏦 Остаётся команде: {report['profits'] - report['total']:.2f}$\n\n"
+            f"⚠️ Без кошелька или с неверным адресом: {len(report['missing'])} на {report['missing_total']:.2f}$\n"
+            f"⏱ {time.perf_counter() - started:.2f} с"
+        )
+    )
+    await status_msg.delete()
+
+# ==================== BACKUP ====================
+@router.message(Command("backup"))
+async def backup_cmd(message: Message):
+    status_msg = await message.answer("💾 Создаю бэкап...")
+    try:
+        result = await asyncio.to_thread(backup_database)
+    except (sqlite3.Error, OSError) as e:
+        await status_msg.edit_text(f"❌ Ошибка бэкапа: {e}")
+        return
+    # Ручной снапшот сдвигает плановый: следующий — через BACKUP_INTERVAL от этого
+    await record_run(scheduled_backup.__name__, time.time())
+
+    await status_msg.edit_text(
+        f"💾 Бэкап создан\n\n"
+        f"📄 {os.path.basename(result['path'])}\n"
+        f"📦 Размер: {result['size'] / 1024 / 1024:.2f} МБ\n"
+        f"⏱ Время: {result['duration']:.2f} с\n"
+        f"🗂 Хранится последних: {BACKUP_KEEP}"
+    )
@@ -0,0 +1,108 @@
+from aiogram import F, Router
+from aiogram.fsm.context import FSMContext
+from aiogram.types import CallbackQuery, Message
+
+from team_bot.db import get_user, update_nickname, update_wallet
+from team_bot.helpers import delete_messages_later
+from team_bot.keyboards import (
+    get_back_keyboard, get_cancel_keyboard, get_profile_keyboard, get_resources_keyboard
+)
+from team_bot.states import BindWallet, ChangeNick
+from team_bot.ton import normalize_ton_address
+
+router = Router(name="user")
+
+@router.message(F.text == "Мой профиль", flags={"throttle": "profile"})
+async def show_profile(message: Message):
+    user = await get_user(message.from_user.id)
+    
+    if not user or user["status"] != "approved":
+        await message.answer("У вас нет доступа к этому разделу.")
+        return
+    
+    profile_text = f"""🗃️ Информация
+ └ ID: {user['user_id']}
+ └ Ник: {user['nickname'] or 'не установлен'}
+ └ Процент: {user['percent']}%
+
+📋 Статистика
+ └ Профитов: {user['profits_count']}
+ └ Сумма Профитов: {user['profits_sum']}$
+
+💰 Кошелек для выплат
+ └ {user['wallet'] or 'не привязан'}"""
+    
+    await message.answer(profile_text, reply_markup=get_profile_keyboard())
+
+@router.callback_query(F.data == "change_nick")
+async def change_nick(callback: CallbackQuery, state: FSMContext):
+    await callback.message.answer("Пришлите новый ник")
+    await state.set_state(ChangeNick.waiting_nick)
+    await state.update_data(profile_msg_id=callback.message.message_id)
+
+@router.message(ChangeNick.waiting_nick)
+async def process_new_nick(message: Message, state: FSMContext):
+    await update_nickname(message.from_user.id, message.text)
+    
+    data = await state.get_data()
+    delete_messages_later(message.chat.id, [data.get("profile_msg_id"), message.message_id])
+    
+    await state.clear()
+    await show_profile(message)
+
+@router.callback_query(F.data == "bind_wallet")
+async def bind_wallet(callback: CallbackQuery, state: FSMContext):
+    await callback.message.answer(
+        "Пришлите свой кошелек в сети TON",
+        reply_markup=get_cancel_keyboard()
+    )
+    await state.set_state(BindWallet.waiting_wallet)
+
+@router.message(BindWallet.waiting_wallet)
+async def process_wallet(message: Message, state: FSMContext):
+    wallet = normalize_ton_address(message.text)
+    if wallet is None:
+        await message.answer(
+            "Неверный формат TON кошелька. Попробуйте снова.",
+            reply_markup=get_cancel_keyboard()
+        )
+        return
+    
+    await update_wallet(message.from_user.id, wallet)
+    await message.answer("Кошелек успешно привязан", reply_markup=get_back_keyboard())
+    await state.clear()
+
+@router.callback_query(F.data == "cancel")
+async def cancel_action(callback: CallbackQuery, state: FSMContext):
+    await state.clear()
+    await callback.message.delete()
+    await callback.answer("Отменено")
+
+@router.callback_query(F.data == "back_to_profile", flags={"throttle": "profile"})
+async def back_to_profile(callback: CallbackQuery):
+    await callback.message.delete()
+    user = await get_user(callback.from_user.id)
+    
+    profile_text = f"""🗃️ Информация
+ └ ID: {user['user_id']}
+ └ Ник: {user['nickname'] or 'не установлен'}
+ └ Процент: {user['percent']}%
+
+📋 Статистика
+ └ Профитов: {user['profits_count']}
+ └ Сумма Профитов: {user['profits_sum']}$
+
+💰 Кошелек для выплат
+ └ {user['wallet'] or 'не привязан'}"""
+    
+    await callback.message.answer(profile_text, reply_markup=get_profile_keyboard())
+
+@router.message(F.text == "Ресурсы", flags={"throttle": "profile"})
+async def show_resources(message: Message):
+    user = await get_user(message.from_user.id)
+    
+    if not user or user["status"] != "approved":
+        await message.answer("У вас нет доступа к этому разделу.")
+        return
+    
+    await message.answer("Ресурсы команды", reply_markup=get_resources_keyboard())
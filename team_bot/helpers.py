@@ -0,0 +1,105 @@
+import asyncio
+import logging
+from collections import OrderedDict
+
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup
+
+from team_bot import app
+from team_bot.config import DELETE_CONCURRENCY, DIGEST_HEADER, SEEN_ACTIONS_LIMIT
+from team_bot.db import change_user_status, chunked
+from team_bot.notifications import outbox
+
+
+background_tasks = set()
+
+def run_in_background(coro):
+    # Держим ссылку на задачу, иначе сборщик мусора может снять её до завершения
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+async def delete_messages(chat_id: int, message_ids: list):
+    # deleteMessages удаляет до 100 сообщений одним запросом. Если пачка не прошла
+    # (например, есть сообщения старше 48 часов), удаляем по одному,
+    # не больше DELETE_CONCURRENCY запросов одновременно
+    message_ids = [msg_id for msg_id in message_ids if msg_id]
+    semaphore = asyncio.Semaphore(DELETE_CONCURRENCY)
+
+    async def delete_one(msg_id: int):
+        async with semaphore:
+            try:
+                await app.bot.delete_message(chat_id, msg_id)
+            except TelegramAPIError:
+                pass
+
+    for chunk in chunked(message_ids, 100):
+        try:
+            await app.bot.delete_messages(chat_id, chunk)
+        except TelegramAPIError as e:
+            logging.debug("delete_messages in %s failed, falling back: %s", chat_id, e)
+            await asyncio.gather(*(delete_one(msg_id) for msg_id in chunk))
+
+def delete_messages_later(chat_id: int, message_ids: list):
+    # Уборка после ответа пользователю: хендлер не ждёт удаления
+    return run_in_background(delete_messages(chat_id, message_ids))
+
+class SeenActions:
+    # Ограниченное множество уже обработанных нажатий, старые вытесняются первыми
+    def __init__(self, limit: int = SEEN_ACTIONS_LIMIT):
+        self.limit = limit
+        self.keys = OrderedDict()
+
+    def __contains__(self, key) -> bool:
+        return key in self.keys
+
+    def add(self, key):
+        self.keys[key] = None
+        if len(self.keys) > self.limit:
+            self.keys.popitem(last=False)
+
+    def discard(self, key):
+        self.keys.pop(key, None)
+
+
+seen_actions = SeenActions()
+
+async def claim_status_change(callback: CallbackQuery, action: str, status: str, expected: tuple,
+                              notice: str = None, markup: str = None) -> bool:
+    # Только первое нажатие на карточке меняет статус; повторы (двойной клик,
+    # второй админ, повторная доставка колбэка) отвечают сразу и ничего не делают
+    # В ключе есть user_id: в дайджесте на одном сообщении кнопки нескольких заявок
+    user_id = int(callback.data.split("_")[1])
+    key = (callback.message.chat.id, callback.message.message_id, action, user_id)
+    if key in seen_actions:
+        await callback.answer("Уже обработано")
+        return False
+    seen_actions.add(key)
+    try:
+        changed = await change_user_status(user_id, status, expected, notice, markup)
+    except Exception:
+        seen_actions.discard(key)
+        raise
+    if not changed:
+        await callback.answer("Уже обработано другим администратором")
+    elif notice:
+        outbox.wake()
+    return changed
+
+async def mark_application(callback: CallbackQuery, label: str):
+    # Карточка одной заявки помечается целиком. В дайджесте убирается только
+    # строка кнопок обработанной заявки, остальные остаются рабочими
+    message = callback.message
+    if not message.text.startswith(DIGEST_HEADER):
+        await message.edit_text(f"{message.text}\n\n{label}")
+        return
+    suffix = "_" + callback.data.split("_")[1]
+    rows = [
+        row for row in message.reply_markup.inline_keyboard
+        if not any(button.callback_data.endswith(suffix) for button in row)
+    ] if message.reply_markup else []
+    await message.edit_text(
+        f"{message.text}\n{label}: ID {suffix[1:]}",
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=rows) if rows else None
+    )
@@ -0,0 +1,118 @@
+from aiogram.types import (
+    InlineKeyboardButton, InlineKeyboardMarkup, KeyboardButton, ReplyKeyboardMarkup
+)
+
+from team_bot.config import RESOURCES_LINKS, SCHEDULE_REPEATS
+
+
+def get_start_keyboard():
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="Подать заявку", callback_data="apply")]
+    ])
+
+def get_confirm_keyboard():
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="Отправить", callback_data="submit")],
+        [InlineKeyboardButton(text="Заполнить заново", callback_data="restart")]
+    ])
+
+def get_main_menu():
+    return ReplyKeyboardMarkup(
+        keyboard=[
+            [KeyboardButton(text="Мой профиль")],
+            [KeyboardButton(text="Ресурсы")]
+        ],
+        resize_keyboard=True
+    )
+
+def get_profile_keyboard():
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="Изменить ник", callback_data="change_nick")],
+        [InlineKeyboardButton(text="Привязать кошелек", callback_data="bind_wallet")]
+    ])
+
+def get_resources_keyboard():
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="Общий чат", url=RESOURCES_LINKS["chat"])],
+        [InlineKeyboardButton(text="Выплаты", url=RESOURCES_LINKS["payments"])],
+        [InlineKeyboardButton(text="Логи", url=RESOURCES_LINKS["logs"])],
+        [InlineKeyboardButton(text="Обновления", url=RESOURCES_LINKS["updates"])]
+    ])
+
+def get_cancel_keyboard():
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="Отмена", callback_data="cancel")]
+    ])
+
+def get_back_keyboard():
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="Назад", callback_data="back_to_profile")]
+    ])
+
+def get_admin_application_keyboard(user_id: int):
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="✅ Одобрить", callback_data=f"approve_{user_id}")],
+        [InlineKeyboardButton(text="❌ Отклонить", callback_data=f"reject_{user_id}")]
+    ])
+
+def get_admin_digest_keyboard(applications: list):
+    # По строке кнопок на заявку; номер совпадает с номером в тексте дайджеста
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [
+            InlineKeyboardButton(text=f"✅ {i}. @{a['username'] or a['user_id']}", callback_data=f"approve_{a['user_id']}"),
+            InlineKeyboardButton(text=f"❌ {i}", callback_data=f"reject_{a['user_id']}")
+        ]
+        for i, a in enumerate(applications, 1)
+    ])
+
+def get_admin_panel_keyboard():
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="🔍 Найти пользователя", callback_data="admin_search")],
+        [InlineKeyboardButton(text="🗂 Очередь заявок", callback_data="review_page_0")],
+        [InlineKeyboardButton(text="📋 Заявки: массовые действия", callback_data="bulk_page_0")],
+        [InlineKeyboardButton(text="📥 Импорт профитов", callback_data="bulk_import")],
+        [InlineKeyboardButton(text="📢 Рассылки", callback_data="admin_broadcast")],
+        [InlineKeyboardButton(text="🛡️ Управление админами", callback_data="admin_manage_admins")],
+        [InlineKeyboardButton(text="📊 Статистика", callback_data="admin_stats")]
+    ])
+
+def get_broadcast_keyboard():
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="📣 Всем участникам", callback_data="broadcast_all")],
+        [InlineKeyboardButton(text="🎯 По сегменту", callback_data="broadcast_segment")],
+        [InlineKeyboardButton(text="👤 Одному пользователю", callback_data="broadcast_one")],
+        [InlineKeyboardButton(text="⏰ Запланировать", callback_data="broadcast_schedule")],
+        [InlineKeyboardButton(text="📋 Запланированные", callback_data="scheduled_list")],
+        [InlineKeyboardButton(text="🗑 Удалить рассылку", callback_data="delete_broadcast_menu")],
+        [InlineKeyboardButton(text="🔙 Назад", callback_data="admin_panel")]
+    ])
+
+def get_schedule_repeat_keyboard():
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text=label, callback_data=f"schedule_repeat_{key}")]
+        for key, (label, _) in SCHEDULE_REPEATS.items()
+    ] + [[InlineKeyboardButton(text="🔙 Отмена", callback_data="admin_broadcast")]])
+
+def get_delete_broadcast_keyboard():
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="📋 Удалить одну рассылку", callback_data="delete_one_broadcast")],
+        [InlineKeyboardButton(text="🗑 Удалить все рассылки", callback_data="delete_all_broadcasts_confirm")],
+        [InlineKeyboardButton(text="🔙 Назад", callback_data="admin_broadcast")]
+    ])
+
+def get_admin_manage_keyboard():
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="➕ Добавить админа", callback_data="add_admin")],
+        [InlineKeyboardButton(text="➖ Удалить админа", callback_data="remove_admin")],
+        [InlineKeyboardButton(text="👥 Список админов", callback_data="list_admins")],
+        [InlineKeyboardButton(text="🔙 Назад", callback_data="admin_panel")]
+    ])
+
+def get_admin_user_keyboard(user_id: int):
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="🚫 Забанить", callback_data=f"ban_{user_id}")],
+        [InlineKeyboardButton(text="📊 Изменить процент", callback_data=f"change_percent_{user_id}")],
+        [InlineKeyboardButton(text="➕ Начислить профит", callback_data=f"add_profit_{user_id}")],
+        [InlineKeyboardButton(text="➖ Удалить профит", callback_data=f"remove_profit_{user_id}")],
+        [InlineKeyboardButton(text="🔙 Назад", callback_data="admin_panel")]
+    ])
@@ -0,0 +1,158 @@
+import logging
+
+from aiogram import BaseMiddleware
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware
+
+from team_bot.config import METRICS_HOST, METRICS_PORT
+
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def format_labels(names, values) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{escape_label(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.values = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels[name] for name in self.labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self):
+        for key, value in self.values.items():
+            yield self.name, format_labels(self.labels, key), value
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels=(), callback=None):
+        super().__init__(name, help_text, labels)
+        self.callback = callback
+
+    def set(self, value: float, **labels):
+        self.values[tuple(labels[name] for name in self.labels)] = value
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def samples(self):
+        if self.callback is not None:
+            yield self.name, "", self.callback()
+            return
+        yield from super().samples()
+
+class Histogram:
+    kind = "histogram"
+    DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, name: str, help_text: str, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self.values = {}
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels[name] for name in self.labels)
+        series = self.values.get(key)
+        if series is None:
+            # [счетчики по корзинам..., +Inf, сумма]
+            series = self.values[key] = [0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += 1
+        series[-1] += value
+
+    def samples(self):
+        names = self.labels + ("le",)
+        for key, series in self.values.items():
+            for bound, count in zip(self.buckets + ("+Inf",), series):
+                yield f"{self.name}_bucket", format_labels(names, key + (bound,)), count
+            yield f"{self.name}_count", format_labels(self.labels, key), series[-2]
+            yield f"{self.name}_sum", format_labels(self.labels, key), series[-1]
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help_text: str, labels=()):
+        return self.register(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels=(), callback=None):
+        return self.register(Gauge(name, help_text, labels, callback))
+
+    def histogram(self, name: str, help_text: str, labels=(), buckets=Histogram.DEFAULT_BUCKETS):
+        return self.register(Histogram(name, help_text, labels, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {value}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+UPDATES_TOTAL = metrics.counter("bot_updates_total", "Входящие апдейты", ("type",))
+API_REQUESTS_TOTAL = metrics.counter("bot_api_requests_total", "Запросы к Telegram API", ("method", "result"))
+MESSAGES_SENT_TOTAL = metrics.counter("bot_messages_sent_total", "Успешно отправленные сообщения", ("method",))
+MESSAGES_FAILED_TOTAL = metrics.counter("bot_messages_failed_total", "Неудачные отправки сообщений", ("method",))
+RETRY_AFTER_TOTAL = metrics.counter("bot_retry_after_total", "Ответы RetryAfter (flood wait)", ("method",))
+BROADCAST_QUEUE_DEPTH = metrics.gauge("bot_broadcast_queue_depth", "Получатели рассылок, ожидающие отправки")
+DB_QUERY_SECONDS = metrics.histogram("bot_db_query_seconds", "Время работы с БД на одно соединение")
+CACHE_REQUESTS_TOTAL = metrics.counter("bot_cache_requests_total", "Обращения к кэшам", ("cache", "result"))
+OUTBOX_TOTAL = metrics.counter("bot_outbox_total", "Обработанные уведомления outbox", ("result",))
+ADMIN_NOTIFICATIONS_TOTAL = metrics.counter("bot_admin_notifications_total", "Сообщения о заявках в группу админов", ("mode",))
+THROTTLED_TOTAL = metrics.counter("bot_throttled_total", "Апдейты, задержанные или отброшенные антифлудом", ("group", "action"))
+
+class UpdateMetricsMiddleware(BaseMiddleware):
+    async def __call__(self, handler, event, data):
+        UPDATES_TOTAL.inc(type=event.event_type)
+        return await handler(event, data)
+
+class ApiMetricsMiddleware(BaseRequestMiddleware):
+    async def __call__(self, make_request, bot, method):
+        method_name = type(method).__name__
+        is_send = method_name.startswith(("Send", "Copy", "Forward"))
+        try:
+            response = await make_request(bot, method)
+        except Exception:
+            API_REQUESTS_TOTAL.inc(method=method_name, result="error")
+            if is_send:
+                MESSAGES_FAILED_TOTAL.inc(method=method_name)
+            raise
+        API_REQUESTS_TOTAL.inc(method=method_name, result="ok")
+        if is_send:
+            MESSAGES_SENT_TOTAL.inc(method=method_name)
+        return response
+
+async def start_metrics_server(port: int = METRICS_PORT):
+    from aiohttp import web
+
+    async def handle_metrics(request):
+        return web.Response(text=metrics.render(), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, METRICS_HOST, port).start()
+    logging.info("Metrics: http://%s:%s/metrics", METRICS_HOST, port)
+    return runner
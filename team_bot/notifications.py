@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import time
+from collections import deque
+
+from aiogram.exceptions import TelegramAPIError
+
+from team_bot import app
+from team_bot.config import (
+    ADMIN_GROUP_ID, APPLICATION_QUESTIONS, DIGEST_HEADER, DIGEST_MAX_ITEMS, DIGEST_THRESHOLD, DIGEST_WINDOW, NOTIFY_RATE,
+    OUTBOX_BATCH, OUTBOX_CLAIM_TTL, OUTBOX_MAX_ATTEMPTS, OUTBOX_MAX_BACKOFF, OUTBOX_POLL_INTERVAL
+)
+from team_bot.db import claim_outbox, finish_outbox, mark_undeliverable, retry_outbox
+from team_bot.keyboards import get_admin_application_keyboard, get_admin_digest_keyboard, get_main_menu
+from team_bot.metrics import ADMIN_NOTIFICATIONS_TOTAL, OUTBOX_TOTAL, metrics
+from team_bot.session import classify_error
+
+
+# Клавиатуры, которые можно приложить к уведомлению из outbox (колонка markup)
+OUTBOX_MARKUPS = {"main_menu": get_main_menu}
+PROFIT_NOTICE = "🌪 Поздравляем! Вы совершили профит\n └ Сумма: {amount}$"
+
+class OutboxSender:
+    # Доставка уведомлений из таблицы outbox: записи появляются в одной
+    # транзакции с изменением в БД и удаляются только после отправки,
+    # поэтому ни медленный API, ни рестарт не теряют уведомления.
+    # Работает у лидера планировщика — общий лимит скорости на всех воркеров
+    def __init__(self, rate: float = NOTIFY_RATE, batch: int = OUTBOX_BATCH,
+                 poll_interval: float = OUTBOX_POLL_INTERVAL):
+        self.rate = rate
+        self.batch = batch
+        self.poll_interval = poll_interval
+        self.wakeup = asyncio.Event()
+
+    def wake(self):
+        # Хендлеры зовут после commit, чтобы не ждать очередного опроса
+        self.wakeup.set()
+
+    async def send(self, entry: dict) -> bool:
+        # True — запись можно удалять: доставлено, адресат недоступен навсегда,
+        # запрос не пройдёт никогда (bad_request) или кончились попытки
+        markup = OUTBOX_MARKUPS[entry["markup"]]() if entry["markup"] else None
+        try:
+            await app.bot.send_message(entry["chat_id"], entry["text"], reply_markup=markup)
+        except TelegramAPIError as e:
+            kind = classify_error(e)
+            if kind == "permanent":
+                await mark_undeliverable([entry["chat_id"]])
+                OUTBOX_TOTAL.inc(result="undeliverable")
+                return True
+            if kind == "bad_request" or entry["attempts"] >= OUTBOX_MAX_ATTEMPTS:
+                logging.error(
+                    "Notification %s to %s dropped after %s attempts: %s",
+                    entry["id"], entry["chat_id"], entry["attempts"], e
+                )
+                OUTBOX_TOTAL.inc(result="dropped")
+                return True
+            delay = min(OUTBOX_MAX_BACKOFF, 2 ** entry["attempts"])
+            logging.warning("Notification to %s failed, retry in %ss: %s", entry["chat_id"], delay, e)
+            await retry_outbox(entry["id"], delay)
+            OUTBOX_TOTAL.inc(result="retry")
+            return False
+        OUTBOX_TOTAL.inc(result="sent")
+        return True
+
+    async def run(self):
+        # Отправки не ждём по одной: стартуем их с шагом 1/rate, чтобы
+        # задержка API не снижала пропускную способность
+        interval = 1 / self.rate
+        while True:
+            self.wakeup.clear()
+            entries = await claim_outbox(self.batch, OUTBOX_CLAIM_TTL)
+            sending = []
+            for entry in entries:
+                sending.append(asyncio.create_task(self.send(entry)))
+                await asyncio.sleep(interval)
+            results = await asyncio.gather(*sending, return_exceptions=True)
+            done = [entry["id"] for entry, result in zip(entries, results) if result is True]
+            if done:
+                await finish_outbox(done)
+            if len(entries) < self.batch:
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+
+outbox = OutboxSender()
+
+def format_application(application: dict) -> str:
+    answers = "\n".join(
+        f"{APPLICATION_QUESTIONS.get(field, field)}: {answer}" for field, answer in application["answers"].items()
+    )
+    return f"""📨 НОВАЯ ЗАЯВКА
+
+👤 Пользователь: @{application['username'] or 'no_username'}
+🆔 ID: {application['user_id']}
+
+━━━━━━━━━━━━━━━━
+{answers}"""
+
+def format_application_entry(i: int, application: dict) -> str:
+    # Краткая запись для списков: ответы обрезаны, чтобы 10 заявок
+    # гарантированно влезли в 4096 символов
+    lines = [f"{i}. @{application['username'] or 'no_username'} (ID: {application['user_id']})"]
+    for answer in application["answers"].values():
+        answer = str(answer)
+        lines.append(f" └ {answer[:60] + '…' if len(answer) > 60 else answer}")
+    return "\n".join(lines)
+
+def format_digest(applications: list) -> str:
+    entries = [format_application_entry(i, a) for i, a in enumerate(applications, 1)]
+    return "\n\n".join([f"{DIGEST_HEADER}: {len(applications)}", *entries])
+
+class AdminGroupNotifier:
+    # Заявки в группу админов уходят из фоновой очереди. При обычном потоке
+    # каждая заявка — отдельная карточка; когда за минуту приходит больше
+    # threshold заявок, они копятся window секунд и уходят одним дайджестом,
+    # чтобы не упираться в лимит сообщений в группу
+    def __init__(self, chat_id: int = ADMIN_GROUP_ID, threshold: int = DIGEST_THRESHOLD,
+                 window: float = DIGEST_WINDOW, max_items: int = DIGEST_MAX_ITEMS):
+        self.chat_id = chat_id
+        self.threshold = threshold
+        self.window = window
+        self.max_items = max_items
+        self.queue = asyncio.Queue()
+        self.arrivals = deque()
+        self.task = None
+
+    def put(self, user_id: int, username: str, answers: dict):
+        now = time.monotonic()
+        self.arrivals.append(now)
+        while now - self.arrivals[0] > 60:
+            self.arrivals.popleft()
+        self.queue.put_nowait({"user_id": user_id, "username": username, "answers": answers})
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    def bursting(self) -> bool:
+        return len(self.arrivals) > self.threshold
+
+    async def send(self, text: str, reply_markup, mode: str):
+        try:
+            await app.bot.send_message(self.chat_id, text, reply_markup=reply_markup)
+            ADMIN_NOTIFICATIONS_TOTAL.inc(mode=mode)
+        except TelegramAPIError as e:
+            logging.warning("Admin group notification failed: %s", e)
+
+    async def run(self):
+        while not self.queue.empty():
+            if not self.bursting() and self.queue.qsize() == 1:
+                application = self.queue.get_nowait()
+                await self.send(
+                    format_application(application),
+                    get_admin_application_keyboard(application["user_id"]),
+                    "card"
+                )
+                continue
+            await asyncio.sleep(self.window)
+            batch = []
+            while len(batch) < self.max_items and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            await self.send(format_digest(batch), get_admin_digest_keyboard(batch), "digest")
+
+
+admin_notifier = AdminGroupNotifier()
+ADMIN_NOTIFICATION_QUEUE_DEPTH = metrics.gauge(
+    "bot_admin_notification_queue_depth", "Заявки, ожидающие отправки в группу админов",
+    callback=lambda: admin_notifier.queue.qsize()
+)
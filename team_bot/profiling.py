@@ -0,0 +1,118 @@
+import re
+import time
+from contextvars import ContextVar
+
+from aiogram import BaseMiddleware
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware
+from aiogram.types import CallbackQuery
+
+from team_bot.config import PERF_ENABLED
+
+
+class LatencyHistogram:
+    # Лог-линейная гистограмма в стиле HDR: значения в микросекундах,
+    # 32 под-корзины на каждую степень двойки (относительная ошибка ~3%)
+    SUB_BITS = 5
+    SUB_COUNT = 1 << SUB_BITS
+
+    def __init__(self):
+        self.counts = {}
+        self.total = 0
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        shift = value.bit_length() - self.SUB_BITS - 1
+        if shift <= 0:
+            return value
+        return shift * self.SUB_COUNT + (value >> shift)
+
+    def _upper(self, index: int) -> int:
+        if index < 2 * self.SUB_COUNT:
+            return index
+        shift = index // self.SUB_COUNT - 1
+        return ((index - shift * self.SUB_COUNT + 1) << shift) - 1
+
+    def record(self, value_us: int):
+        index = self._index(value_us)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+        if value_us > self.max:
+            self.max = value_us
+
+    def percentile(self, q: float) -> int:
+        if not self.total:
+            return 0
+        rank = max(1, int(self.total * q / 100 + 0.5))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._upper(index), self.max)
+        return self.max
+
+
+class PerfStats:
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.handlers = {}
+
+    def record(self, key: str, wall_ns: int, db_ns: int, api_ns: int):
+        hists = self.handlers.get(key)
+        if hists is None:
+            hists = self.handlers[key] = {
+                "wall": LatencyHistogram(),
+                "db": LatencyHistogram(),
+                "api": LatencyHistogram()
+            }
+        hists["wall"].record(wall_ns // 1000)
+        hists["db"].record(db_ns // 1000)
+        hists["api"].record(api_ns // 1000)
+
+    def reset(self):
+        self.handlers.clear()
+
+    def top(self, limit: int = 10):
+        return sorted(
+            self.handlers.items(),
+            key=lambda item: item[1]["wall"].percentile(99),
+            reverse=True
+        )[:limit]
+
+
+perf_stats = PerfStats(enabled=PERF_ENABLED)
+# [время в БД, время в Telegram API] в наносекундах для текущего апдейта
+perf_context: ContextVar = ContextVar("perf_context", default=None)
+
+def perf_key(event, data: dict) -> str:
+    handler = data.get("handler")
+    name = handler.callback.__name__ if handler else type(event).__name__
+    if isinstance(event, CallbackQuery) and event.data:
+        # approve_123 -> approve_*, чтобы не плодить ключи на каждый user_id
+        prefix = re.sub(r"\d+", "*", event.data)
+        return f"{name} [{prefix}]"
+    return name
+
+class PerfMiddleware(BaseMiddleware):
+    async def __call__(self, handler, event, data):
+        if not perf_stats.enabled:
+            return await handler(event, data)
+        ctx = [0, 0]
+        token = perf_context.set(ctx)
+        started = time.perf_counter_ns()
+        try:
+            return await handler(event, data)
+        finally:
+            wall = time.perf_counter_ns() - started
+            perf_context.reset(token)
+            perf_stats.record(perf_key(event, data), wall, ctx[0], ctx[1])
+
+class ApiTimingMiddleware(BaseRequestMiddleware):
+    async def __call__(self, make_request, bot, method):
+        ctx = perf_context.get()
+        if ctx is None:
+            return await make_request(bot, method)
+        started = time.perf_counter_ns()
+        try:
+            return await make_request(bot, method)
+        finally:
+            ctx[1] += time.perf_counter_ns() - started
@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+
+from team_bot import app
+from team_bot.backup import scheduled_backup
+from team_bot.broadcasting import broadcast_timers
+from team_bot.config import (
+    BACKUP_INTERVAL, FSM_SWEEP_INTERVAL, LEASE_RENEW_INTERVAL, LEASE_TTL, WALLET_CHECK_CHUNK,
+    WALLET_CHECK_INTERVAL
+)
+from team_bot.db import connect_db, get_wallets_after, set_wallet_flags
+from team_bot.notifications import outbox
+from team_bot.storage import SQLiteStorage
+from team_bot.ton import parse_ton_address
+
+
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+async def try_acquire_lease(name: str, holder: str, ttl: float = LEASE_TTL) -> bool:
+    # Берём аренду, если она свободна, просрочена или уже наша (тогда продлеваем)
+    now = time.time()
+    async with connect_db() as db:
+        cursor = await db.execute("""
+            INSERT INTO leases (name, holder, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at
+            WHERE leases.holder = excluded.holder OR leases.expires_at < ?
+        """, (name, holder, now + ttl, now))
+        await db.commit()
+        return cursor.rowcount > 0
+
+async def release_lease(name: str, holder: str):
+    async with connect_db() as db:
+        await db.execute("DELETE FROM leases WHERE name = ? AND holder = ?", (name, holder))
+        await db.commit()
+
+async def get_last_run(name: str) -> float:
+    async with connect_db() as db:
+        async with db.execute("SELECT last_run_at FROM job_runs WHERE name = ?", (name,)) as cursor:
+            row = await cursor.fetchone()
+            return row[0] if row else 0.0
+
+async def record_run(name: str, ran_at: float):
+    async with connect_db() as db:
+        await db.execute("""
+            INSERT INTO job_runs (name, last_run_at) VALUES (?, ?)
+            ON CONFLICT(name) DO UPDATE SET last_run_at = excluded.last_run_at
+        """, (name, ran_at))
+        await db.commit()
+
+class Scheduler:
+    # Периодические задачи выполняет только экземпляр, держащий аренду в БД;
+    # остальные ждут и перехватывают её, когда лидер перестаёт продлевать
+    def __init__(self, lease_name: str = "scheduler", holder: str = INSTANCE_ID,
+                 ttl: float = LEASE_TTL, renew_interval: float = LEASE_RENEW_INTERVAL):
+        self.lease_name = lease_name
+        self.holder = holder
+        self.ttl = ttl
+        self.renew_interval = renew_interval
+        self.jobs = []
+        self.services = []
+        self.tasks = []
+        self.is_leader = False
+
+    def every(self, interval: float):
+        def decorator(func):
+            self.jobs.append((interval, func))
+            return func
+        return decorator
+
+    def service(self, func):
+        # Долгоживущая корутина, которая работает только у лидера
+        self.services.append(func)
+        return func
+
+    async def run_service(self, func):
+        while True:
+            try:
+                await func()
+            except Exception:
+                logging.exception("Service %s failed", func.__name__)
+            await asyncio.sleep(1)
+
+    async def run_job(self, interval: float, func):
+        # Срок считается от последнего запуска в БД, а не от старта лидера: после
+        # рестарта задача ждёт только остаток интервала, а та, что ни разу не
+        # запускалась, выполняется сразу. После сна срок перечитывается — запуск
+        # могли записать вручную (/backup). Неудачный запуск тоже записывается,
+        # чтобы падающая задача не крутилась без паузы
+        name = func.__name__
+        while True:
+            try:
+                last_run = await get_last_run(name)
+            except Exception:
+                logging.exception("Scheduled job %s: last run lookup failed", name)
+                await asyncio.sleep(self.renew_interval)
+                continue
+            remaining = last_run + interval - time.time()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+                continue
+            started = time.time()
+            try:
+                await func()
+            except Exception:
+                logging.exception("Scheduled job %s failed", name)
+            try:
+                await record_run(name, started)
+            except Exception:
+                logging.exception("Scheduled job %s: run not recorded", name)
+
+    def start_jobs(self):
+        logging.info("%s: became scheduler leader", self.holder)
+        self.tasks = [asyncio.create_task(self.run_job(interval, func)) for interval, func in self.jobs]
+        self.tasks += [asyncio.create_task(self.run_service(func)) for func in self.services]
+
+    def stop_jobs(self):
+        for task in self.tasks:
+            task.cancel()
+        self.tasks = []
+
+    async def run(self):
+        try:
+            while True:
+                try:
+                    leader = await try_acquire_lease(self.lease_name, self.holder, self.ttl)
+                except Exception:
+                    logging.exception("Lease renewal failed")
+                    leader = False
+                if leader and not self.is_leader:
+                    self.start_jobs()
+                elif not leader and self.is_leader:
+                    logging.warning("%s: lost scheduler lease", self.holder)
+                    self.stop_jobs()
+                self.is_leader = leader
+                await asyncio.sleep(self.renew_interval)
+        finally:
+            self.stop_jobs()
+            if self.is_leader:
+                self.is_leader = False
+                await release_lease(self.lease_name, self.holder)
+
+
+scheduler = Scheduler()
+scheduler.service(outbox.run)
+scheduler.service(broadcast_timers.run)
+if BACKUP_INTERVAL:
+    scheduler.every(BACKUP_INTERVAL)(scheduled_backup)
+
+@scheduler.every(FSM_SWEEP_INTERVAL)
+async def sweep_fsm_storage():
+    if not isinstance(app.storage, SQLiteStorage):
+        return
+    await app.storage.execute(
+        "DELETE FROM fsm_storage WHERE state IS NULL AND (data IS NULL OR data = '{}')"
+    )
+
+@scheduler.every(WALLET_CHECK_INTERVAL)
+async def revalidate_wallets():
+    # Кошельки, привязанные до полной проверки адреса, проходим порциями и помечаем
+    # wallet_invalid; пишутся только изменившиеся флаги. Разбор без LRU-кэша
+    # (__wrapped__), чтобы проход по всей базе не вытеснял адреса из хендлеров
+    parse = parse_ton_address.__wrapped__
+    last_id, checked, invalid = 0, 0, 0
+    while rows := await get_wallets_after(last_id, WALLET_CHECK_CHUNK):
+        flags = []
+        for user_id, wallet, flagged in rows:
+            bad = int(parse(wallet.strip()) is None)
+            invalid += bad
+            if bad != flagged:
+                flags.append((bad, user_id, wallet))
+        if flags:
+            await set_wallet_flags(flags)
+        checked += len(rows)
+        last_id = rows[-1][0]
+        await asyncio.sleep(0)
+    if invalid:
+        logging.warning("Wallet check: %s of %s wallets are invalid", invalid, checked)
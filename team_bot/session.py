@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import random
+import time
+
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.exceptions import (
+    TelegramAPIError, TelegramBadRequest, TelegramForbiddenError,
+    TelegramNetworkError, TelegramRetryAfter, TelegramServerError
+)
+
+from team_bot.config import API_MAX_RETRIES, API_MAX_RETRY_AFTER, API_POOL_LIMIT
+from team_bot.metrics import RETRY_AFTER_TOTAL, metrics
+
+
+API_REQUEST_SECONDS = metrics.histogram("bot_api_request_seconds", "Время одного запроса к Telegram API", ("method",))
+API_ERRORS_TOTAL = metrics.counter("bot_api_errors_total", "Ошибки Telegram API по типам", ("method", "kind"))
+
+# Ошибки, после которых писать пользователю бессмысленно
+PERMANENT_ERROR_MARKERS = (
+    "bot was blocked",
+    "user is deactivated",
+    "chat not found",
+    "bot can't initiate conversation",
+    "bot was kicked",
+    "peer_id_invalid"
+)
+
+def classify_error(error: Exception) -> str:
+    if isinstance(error, TelegramRetryAfter):
+        return "flood"
+    if isinstance(error, TelegramServerError):
+        return "server"
+    if isinstance(error, TelegramNetworkError):
+        return "network"
+    if isinstance(error, TelegramForbiddenError):
+        return "permanent"
+    if isinstance(error, TelegramBadRequest):
+        text = error.message.lower()
+        if any(marker in text for marker in PERMANENT_ERROR_MARKERS):
+            return "permanent"
+        return "bad_request"
+    return "other"
+
+def is_permanent_error(error: Exception) -> bool:
+    return classify_error(error) == "permanent"
+
+class TelegramSession(AiohttpSession):
+    def __init__(self, limit: int = API_POOL_LIMIT, max_retries: int = API_MAX_RETRIES, **kwargs):
+        super().__init__(limit=limit, **kwargs)
+        self._connector_init.update(
+            limit_per_host=limit,
+            keepalive_timeout=75,
+            ttl_dns_cache=300
+        )
+        self.max_retries = max_retries
+
+    def backoff(self, attempt: int) -> float:
+        # full jitter: случайная пауза в пределах экспоненциально растущего окна
+        return random.uniform(0, min(30.0, 0.5 * 2 ** attempt))
+
+    async def make_request(self, bot, method, timeout=None):
+        method_name = type(method).__name__
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                return await super().make_request(bot, method, timeout)
+            except TelegramAPIError as e:
+                kind = classify_error(e)
+                API_ERRORS_TOTAL.inc(method=method_name, kind=kind)
+                if kind == "flood":
+                    RETRY_AFTER_TOTAL.inc(method=method_name)
+                    if attempt >= self.max_retries or e.retry_after > API_MAX_RETRY_AFTER:
+                        raise
+                    delay = e.retry_after + random.uniform(0, 1)
+                elif kind == "server" and attempt < self.max_retries:
+                    delay = self.backoff(attempt)
+                else:
+                    # сетевые ошибки не повторяем: сообщение могло уже уйти
+                    raise
+            finally:
+                API_REQUEST_SECONDS.observe(time.perf_counter() - started, method=method_name)
+            attempt += 1
+            logging.warning("%s: %s, retry %s in %.1fs", method_name, kind, attempt, delay)
+            await asyncio.sleep(delay)
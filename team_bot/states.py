@@ -0,0 +1,55 @@
+from aiogram.fsm.state import State, StatesGroup
+
+
+class ApplicationForm(StatesGroup):
+    source = State()
+    experience = State()
+    time = State()
+    why = State()
+    confirm = State()
+
+class ChangeNick(StatesGroup):
+    waiting_nick = State()
+
+class BindWallet(StatesGroup):
+    waiting_wallet = State()
+
+class AdminSearch(StatesGroup):
+    waiting_search = State()
+
+class AdminAddProfit(StatesGroup):
+    waiting_amount = State()
+    user_id = State()
+
+class AdminRemoveProfit(StatesGroup):
+    waiting_amount = State()
+    user_id = State()
+
+class AdminChangePercent(StatesGroup):
+    waiting_percent = State()
+    user_id = State()
+
+class BroadcastAll(StatesGroup):
+    waiting_message = State()
+
+class BroadcastSegment(StatesGroup):
+    waiting_filter = State()
+    waiting_message = State()
+
+class BroadcastSchedule(StatesGroup):
+    waiting_time = State()
+    waiting_repeat = State()
+    waiting_message = State()
+
+class BroadcastOne(StatesGroup):
+    waiting_user = State()
+    waiting_message = State()
+
+class AddAdmin(StatesGroup):
+    waiting_id = State()
+
+class RemoveAdmin(StatesGroup):
+    waiting_id = State()
+
+class BulkProfitImport(StatesGroup):
+    waiting_file = State()
@@ -0,0 +1,105 @@
+import asyncio
+import json
+import logging
+import sqlite3
+
+import aiosqlite
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder
+
+from team_bot.config import DB_TIMEOUT
+
+
+class SQLiteStorage(BaseStorage):
+    # FSM в общей SQLite-базе, чтобы состояние видели все воркеры.
+    # Одно соединение на процесс; запросы не должны перемежаться, иначе
+    # незакрытое чтение мешает записи из другого процесса
+    def __init__(self, path: str):
+        self.path = path
+        self.key_builder = DefaultKeyBuilder(with_destiny=True)
+        self.db = None
+        self.lock = asyncio.Lock()
+        self.sessions = 0
+        self.sessions_task = None
+
+    async def execute(self, query: str, params: tuple = ()):
+        async with self.lock:
+            if self.db is None:
+                # isolation_level=None: каждый запрос сам себе транзакция
+                self.db = await aiosqlite.connect(self.path, timeout=DB_TIMEOUT, isolation_level=None)
+                # в WAL-режиме NORMAL не теряет целостность, но не делает fsync на каждый коммит
+                await self.db.execute("PRAGMA synchronous=NORMAL")
+                await self.db.execute("""
+                    CREATE TABLE IF NOT EXISTS fsm_storage (
+                        key TEXT PRIMARY KEY,
+                        state TEXT,
+                        data TEXT
+                    )
+                """)
+            async with self.db.execute(query, params) as cursor:
+                return await cursor.fetchone()
+
+    async def clear_field(self, key: str, column: str):
+        # state.clear() (сброс state и data) идёт на каждом /start. Отсутствующую
+        # запись не трогаем — только чтение, без блокировки записи общей базы;
+        # запись, в которой ничего не осталось, удаляется
+        if await self.execute("SELECT 1 FROM fsm_storage WHERE key = ?", (key,)) is None:
+            return
+        other = "data" if column == "state" else "state"
+        await self.execute(
+            f"DELETE FROM fsm_storage WHERE key = ? AND ({other} IS NULL OR {other} = '{{}}')", (key,)
+        )
+        await self.execute(f"UPDATE fsm_storage SET {column} = NULL WHERE key = ?", (key,))
+
+    async def set_state(self, key, state=None):
+        state = state.state if isinstance(state, State) else state
+        if state is None:
+            await self.clear_field(self.key_builder.build(key), "state")
+            return
+        await self.execute("""
+            INSERT INTO fsm_storage (key, state) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET state = excluded.state
+        """, (self.key_builder.build(key), state))
+
+    async def get_state(self, key):
+        row = await self.execute(
+            "SELECT state FROM fsm_storage WHERE key = ?", (self.key_builder.build(key),)
+        )
+        return row[0] if row else None
+
+    async def set_data(self, key, data):
+        if not data:
+            await self.clear_field(self.key_builder.build(key), "data")
+            return
+        await self.execute("""
+            INSERT INTO fsm_storage (key, data) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET data = excluded.data
+        """, (self.key_builder.build(key), json.dumps(data)))
+
+    async def get_data(self, key):
+        row = await self.execute(
+            "SELECT data FROM fsm_storage WHERE key = ?", (self.key_builder.build(key),)
+        )
+        return json.loads(row[0]) if row and row[0] else {}
+
+    def count_sessions(self) -> int:
+        # Вызывается при сборе /metrics прямо в event loop: отдаём последнее
+        # посчитанное значение, а пересчёт идёт фоновой задачей через aiosqlite —
+        # заблокированная база не останавливает хендлеры
+        if self.sessions_task is None or self.sessions_task.done():
+            self.sessions_task = asyncio.ensure_future(self.refresh_sessions())
+        return self.sessions
+
+    async def refresh_sessions(self):
+        try:
+            row = await self.execute("SELECT COUNT(*) FROM fsm_storage WHERE state IS NOT NULL")
+            self.sessions = row[0]
+        except sqlite3.Error as e:
+            logging.warning("FSM sessions count failed: %s", e)
+
+    async def close(self):
+        if self.sessions_task is not None:
+            self.sessions_task.cancel()
+        if self.db is not None:
+            await self.db.close()
+            self.db = None
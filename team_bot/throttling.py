@@ -0,0 +1,73 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import CallbackQuery
+
+from team_bot.config import THROTTLE_RATES, THROTTLE_TTL
+from team_bot.metrics import THROTTLED_TOTAL
+
+
+class TokenBuckets:
+    # Токен-бакеты по ключу (user_id, группа) в одном OrderedDict: порядок —
+    # время последнего обращения, поэтому просроченные записи снимаются с начала
+    def __init__(self, ttl: float = THROTTLE_TTL):
+        self.ttl = ttl
+        self.buckets = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.buckets)
+
+    def expire(self, now: float):
+        while self.buckets:
+            _, updated = next(iter(self.buckets.values()))
+            if now - updated < self.ttl:
+                break
+            self.buckets.popitem(last=False)
+
+    def acquire(self, key, rate: float, burst: int, max_delay: float = 0.0, now: float = None):
+        # Возвращает, сколько ждать до выполнения (0 — сразу), или None — отбросить.
+        # При ожидании токен берётся в долг, чтобы следующие апдейты вставали в очередь за ним
+        now = time.monotonic() if now is None else now
+        self.expire(now)
+        tokens, updated = self.buckets.pop(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        wait = max(0.0, (1 - tokens) / rate)
+        if wait > max_delay:
+            self.buckets[key] = (tokens, now)
+            return None
+        self.buckets[key] = (tokens - 1, now)
+        return wait
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    # Inner-middleware: группа берётся из флага хендлера throttle
+    # (по умолчанию "default"), лимиты — из THROTTLE_RATES
+    def __init__(self, rates: dict = THROTTLE_RATES):
+        self.rates = rates
+        self.buckets = TokenBuckets()
+
+    async def __call__(self, handler, event, data):
+        user = data.get("event_from_user")
+        group = get_flag(data, "throttle", default="default")
+        limits = self.rates.get(group)
+        if user is None or limits is None:
+            return await handler(event, data)
+
+        delay = self.buckets.acquire((user.id, group), *limits)
+        if delay is None:
+            THROTTLED_TOTAL.inc(group=group, action="dropped")
+            # Без ответа у кнопки крутится индикатор загрузки до таймаута
+            if isinstance(event, CallbackQuery):
+                try:
+                    await event.answer()
+                except TelegramAPIError:
+                    pass
+            return None
+        if delay:
+            THROTTLED_TOTAL.inc(group=group, action="delayed")
+            await asyncio.sleep(delay)
+        return await handler(event, data)
@@ -0,0 +1,56 @@
+import base64
+import binascii
+import re
+from functools import lru_cache
+
+from team_bot.config import TON_ADDRESS_CACHE_SIZE
+
+# Адреса TON: user-friendly — 48 символов base64/base64url поверх 36 байт
+# (тег, workchain, 32 байта хеша, CRC16-XMODEM первых 34 байт) и raw — "wc:hex".
+# Принимаются только основная сеть и workchain 0 / -1
+TAG_BOUNCEABLE = 0x11
+TAG_NON_BOUNCEABLE = 0x51
+TAG_TESTNET = 0x80
+WORKCHAINS = (0, -1)
+
+FRIENDLY_PATTERN = re.compile(r"[A-Za-z0-9_\-+/]{48}")
+RAW_PATTERN = re.compile(r"(-?\d+):([0-9a-fA-F]{64})")
+
+
+def parse_friendly(address: str):
+    data = base64.urlsafe_b64decode(address.replace("+", "-").replace("/", "_"))
+    tag, workchain = data[0], int.from_bytes(data[1:2], "big", signed=True)
+    # binascii.crc_hqx с начальным значением 0 — это и есть CRC16-XMODEM
+    if binascii.crc_hqx(data[:34], 0) != int.from_bytes(data[34:], "big"):
+        return None
+    if tag & TAG_TESTNET or tag not in (TAG_BOUNCEABLE, TAG_NON_BOUNCEABLE):
+        return None
+    return workchain, data[2:34], tag == TAG_BOUNCEABLE
+
+@lru_cache(maxsize=TON_ADDRESS_CACHE_SIZE)
+def parse_ton_address(address: str):
+    # -> (workchain, hash, bounceable) или None; у raw-формы bounceable не задан (None)
+    if FRIENDLY_PATTERN.fullmatch(address):
+        parsed = parse_friendly(address)
+    elif match := RAW_PATTERN.fullmatch(address):
+        parsed = int(match[1]), bytes.fromhex(match[2]), None
+    else:
+        return None
+    if parsed is None or parsed[0] not in WORKCHAINS:
+        return None
+    return parsed
+
+def normalize_ton_address(address: str):
+    # Вид для хранения: user-friendly base64url без пробелов. Флаг bounceable
+    # сохраняется (UQ важен для выплат на ещё не развёрнутый кошелёк),
+    # raw-форма становится bounceable, как принято в кошельках
+    parsed = parse_ton_address(address.strip()) if address else None
+    if parsed is None:
+        return None
+    workchain, account, bounceable = parsed
+    return to_friendly(workchain, account, bounceable is not False)
+
+def to_friendly(workchain: int, account: bytes, bounceable: bool = True) -> str:
+    tag = TAG_BOUNCEABLE if bounceable else TAG_NON_BOUNCEABLE
+    data = bytes([tag]) + workchain.to_bytes(1, "big", signed=True) + account
+    return base64.urlsafe_b64encode(data + binascii.crc_hqx(data, 0).to_bytes(2, "big")).decode()
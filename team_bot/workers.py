@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import os
+import queue as queue_module
+import time
+
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import Update
+from aiogram.types.update import UpdateTypeLookupError
+
+from team_bot import app
+from team_bot.config import METRICS_PORT, WORKER_CONCURRENCY
+from team_bot.db import init_db
+from team_bot.metrics import start_metrics_server
+from team_bot.scheduler import scheduler
+
+
+def shard_for(update: Update, workers: int) -> int:
+    # Все апдейты одного пользователя попадают в один воркер
+    try:
+        user = getattr(update.event, "from_user", None)
+    except UpdateTypeLookupError:
+        user = None
+    return user.id % workers if user else 0
+
+async def poll_updates():
+    allowed_updates = app.dp.resolve_used_update_types()
+    offset = None
+    while True:
+        try:
+            updates = await app.bot.get_updates(offset=offset, timeout=30, allowed_updates=allowed_updates)
+        except TelegramAPIError as e:
+            logging.warning("get_updates failed: %s", e)
+            await asyncio.sleep(1)
+            continue
+        for update in updates:
+            offset = update.update_id + 1
+            yield update
+
+async def feed_workers(queues: list, source):
+    async for update in source:
+        raw = update.model_dump(mode="json", exclude_none=True)
+        queues[shard_for(update, len(queues))].put(raw)
+
+def take_batch(queue, limit: int = WORKER_CONCURRENCY) -> list:
+    # Один переход в поток на пачку апдейтов, а не на каждый
+    batch = [queue.get()]
+    while len(batch) < limit:
+        try:
+            batch.append(queue.get_nowait())
+        except queue_module.Empty:
+            break
+    return batch
+
+async def worker_loop(index: int, queue, ready):
+    if METRICS_PORT:
+        await start_metrics_server(METRICS_PORT + 1 + index)
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(WORKER_CONCURRENCY)
+    tasks = set()
+
+    async def process(raw: dict):
+        try:
+            await app.dp.feed_raw_update(app.bot, raw)
+        except Exception:
+            logging.exception("Worker %s: update %s failed", index, raw.get("update_id"))
+        finally:
+            semaphore.release()
+
+    scheduler_task = asyncio.create_task(scheduler.run())
+    ready.put(index)
+    running = True
+    while running:
+        for raw in await loop.run_in_executor(None, take_batch, queue):
+            if raw is None:
+                running = False
+                break
+            await semaphore.acquire()
+            task = asyncio.create_task(process(raw))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    if tasks:
+        await asyncio.gather(*tasks)
+    scheduler_task.cancel()
+    await asyncio.gather(scheduler_task, return_exceptions=True)
+    await app.storage.close()
+    await app.bot.session.close()
+
+def worker_main(index: int, queue, ready, session_factory=None):
+    app.create_app(session_factory() if session_factory is not None else None)
+    asyncio.run(worker_loop(index, queue, ready))
+
+def run_supervisor(workers: int, source=None, session_factory=None) -> float:
+    # Один получатель апдейтов и N процессов-воркеров с общими БД и FSM.
+    # Возвращает время обработки всех апдейтов (для нагрузочных тестов)
+    import multiprocessing
+    os.environ["FSM_STORAGE"] = "sqlite"
+    asyncio.run(init_db())
+    context = multiprocessing.get_context("spawn")
+    ready = context.Queue()
+    queues = [context.Queue() for _ in range(workers)]
+    processes = [
+        context.Process(
+            target=worker_main,
+            args=(i, queues[i], ready, session_factory),
+            name=f"bot-worker-{i}"
+        )
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for _ in processes:
+        ready.get()
+    
+    started = time.perf_counter()
+    try:
+        if source is None:
+            app.create_app()
+            source = poll_updates()
+        asyncio.run(feed_workers(queues, source))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for queue in queues:
+            queue.put(None)
+        for process in processes:
+            process.join()
+    return time.perf_counter() - started